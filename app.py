@@ -1,6 +1,7 @@
 from flask import Flask
 from flask_cors import CORS
 from infrastructure.clients import init_clients
+from infrastructure.json_provider import ORJSONProvider
 from infrastructure.logger import setup_logger
 from dotenv import load_dotenv
 from routes.connections import connection_bp
@@ -23,6 +24,7 @@ from routes.subscriptions import subscriptions_bp
 
 def create_app():
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
     CORS(app)
 
     @app.route('/health')
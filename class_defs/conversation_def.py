@@ -11,6 +11,7 @@ Defines a dataclass named Conversation with the following fields:
     
     to_dict returns a Conversation object formatted as a python dictionary.
     from_dict converts a python dictionary into a custom Conversation object.
+    from_firestore_snapshot builds a Conversation straight from a Firestore DocumentSnapshot.
 """
 
 from dataclasses import dataclass
@@ -18,7 +19,7 @@ from dataclasses import field as attr_field
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     user_id: str
     conversation_id: str
@@ -29,7 +30,6 @@ class Conversation:
     situation: Optional[str] = None
     topic: Optional[str] = None
 
-
     def to_dict(self):
         return {
             "user_id": self.user_id,
@@ -57,6 +57,31 @@ class Conversation:
             created_at= created_at_str if created_at_str else datetime.now(timezone.utc)
         )
 
+    @classmethod
+    def from_firestore_snapshot(cls, snap):
+        """
+        Builds a Conversation from a DocumentSnapshot field by field, skipping the
+        full to_dict() copy that from_dict(snap.to_dict()) would make first.
+        """
+        def _get(field_name, default=None):
+            try:
+                return snap.get(field_name)
+            except KeyError:
+                return default
+
+        created_at = _get("created_at")
+
+        return cls(
+            user_id=snap.get("user_id"),
+            conversation_id=snap.get("conversation_id"),
+            conversation=_get("conversation", []),
+            connection_id=_get("connection_id"),
+            situation=_get("situation"),
+            topic=_get("topic"),
+            spurs=_get("spurs", {}),
+            created_at=created_at if created_at else datetime.now(timezone.utc)
+        )
+
     @classmethod
     def get_attr(cls, convo_instance: "Conversation", attr_key: str):
         """
@@ -52,6 +52,11 @@ class Spur:
     @classmethod
     def from_dict(cls, data):
         created_at_str = data.get("created_at")
+        # Firestore hands back stored timestamps as datetime objects already
+        if isinstance(created_at_str, datetime):
+            created_at = created_at_str
+        else:
+            created_at = datetime.fromisoformat(created_at_str) if created_at_str else datetime.now(timezone.utc)
 
         return cls(
             user_id=data["user_id"],
@@ -64,7 +69,7 @@ class Spur:
             variant=data.get("variant"),
             tone=data.get("tone"),
             text=data.get("text"),
-            created_at=datetime.fromisoformat(created_at_str) if created_at_str else datetime.now(timezone.utc)
+            created_at=created_at
         )
 
     @classmethod
@@ -1,12 +1,72 @@
 import base64
-from typing import List
+import os
+from typing import List, Optional
 from flask import request
+from werkzeug.datastructures import FileStorage
 
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
 
+# Leading signature bytes for the image formats accepted by upload endpoints
+_IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+
+
+def detect_image_format(image_bytes: bytes) -> Optional[str]:
+    """
+    Identify an image format from its leading bytes rather than the client-supplied filename.
+    
+    Args:
+        image_bytes: Raw image content (only the first 12 bytes are inspected)
+        
+    Returns:
+        'jpeg', 'png', 'gif' or 'webp', or None if the content is not a recognized image
+    """
+    header = image_bytes[:12]
+    for signature, image_format in _IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return image_format
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+def get_upload_size(file_obj: FileStorage) -> Optional[int]:
+    """
+    Determine the size of an uploaded file from its spooled stream without reading it.
+    
+    The multipart part's Content-Length header is client-supplied and is not used.
+    
+    Args:
+        file_obj: FileStorage object from Flask
+        
+    Returns:
+        Size in bytes, or None if the stream can't be measured
+    """
+    stream = file_obj.stream
+    
+    # Werkzeug spools larger uploads to a temporary file; its size is on the descriptor
+    try:
+        return os.fstat(stream.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        pass
+    
+    # Smaller uploads stay in memory; measure by seeking to the end and back
+    try:
+        position = stream.tell()
+        size = stream.seek(0, os.SEEK_END)
+        stream.seek(position)
+        return size
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
 def extract_image_bytes_from_request(field_name: str) -> List[bytes]:
     """
     Extract image bytes from request, handling both file uploads and base64 data.
@@ -24,7 +84,6 @@ def extract_image_bytes_from_request(field_name: str) -> List[bytes]:
         files = request.files.getlist(field_name)
         for file_obj in files:
             if file_obj and file_obj.filename:
-                file_obj.seek(0)
                 image_bytes = file_obj.read()
                 if image_bytes:
                     image_bytes_list.append(image_bytes)
@@ -54,4 +113,14 @@ def extract_image_bytes_from_request(field_name: str) -> List[bytes]:
                         logger.error(f"Failed to decode base64 image: {e}")
                         continue
     
+    # Check for base64 data in a form field
+    elif field_name in request.form:
+        img_data = request.form.get(field_name)
+        if img_data:
+            try:
+                image_bytes = base64.b64decode(img_data)
+                image_bytes_list.append(image_bytes)
+            except Exception as e:
+                logger.error(f"Failed to decode base64 image: {e}")
+    
     return image_bytes_list
\ No newline at end of file
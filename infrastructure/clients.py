@@ -6,9 +6,11 @@ from firebase_admin import firestore, credentials
 from google.oauth2 import service_account
 import openai
 import os
+import threading
 
 # Local application imports
 # Use relative import if logger is in the same directory
+from google.api_core import retry as api_retry
 from google.cloud import vision
 from google.cloud.firestore import Client as FirestoreClient
 from .logger import get_logger 
@@ -19,8 +21,18 @@ _vision_client = None
 _openai_client = None
 _firestore_db = None
 
+# Guards lazy construction so concurrent requests share one client (and one gRPC channel)
+_vision_client_lock = threading.Lock()
+_firestore_db_lock = threading.Lock()
+
 logger = get_logger(__name__)
 
+# Retry for idempotent Firestore writes (set/delete) on transient errors
+# (429/500/503), with exponential backoff capped at 5s and 30s overall
+FIRESTORE_WRITE_RETRY = api_retry.Retry(
+    predicate=api_retry.if_transient_error, initial=0.1, maximum=5.0, multiplier=2.0, timeout=30.0
+)
+
 # --- Initialization Function ---
 def init_clients(app):
     """
@@ -31,7 +43,7 @@ def init_clients(app):
         app: Flask app object providing configuration.
     """
     logger.error("LOG.INFO: Initializing external clients...")
-    global _firestore_db
+    global _firestore_db, _vision_client, _openai_client
 
     # --- Firebase Admin ---
     try:
@@ -93,10 +105,12 @@ def get_firestore_db() -> FirestoreClient:
     """ Safely returns the initialized Firestore client instance. """
     global _firestore_db
     if not _firestore_db:
-        try:
-            _firestore_db = firestore.client()
-        except Exception as e:
-            raise RuntimeError("Firestore client has not been initialized.")
+        with _firestore_db_lock:
+            if not _firestore_db:
+                try:
+                    _firestore_db = firestore.client()
+                except Exception as e:
+                    raise RuntimeError("Firestore client has not been initialized.")
     return _firestore_db
 
 
@@ -104,10 +118,12 @@ def get_vision_client() -> vision.ImageAnnotatorClient:
     """ Safely returns the initialized Google Cloud Vision client instance. """
     global _vision_client
     if not _vision_client:
-        try:
-            _vision_client = vision.ImageAnnotatorClient()
-        except Exception as e:
-            raise RuntimeError("Vision client has not been initialized.")
+        with _vision_client_lock:
+            if not _vision_client:
+                try:
+                    _vision_client = vision.ImageAnnotatorClient()
+                except Exception as e:
+                    raise RuntimeError("Vision client has not been initialized.")
     return _vision_client
 
 def get_openai_client() -> openai.OpenAI:
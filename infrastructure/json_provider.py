@@ -0,0 +1,44 @@
+# infrastructure/json_provider.py
+
+import decimal
+import uuid
+from datetime import date
+from typing import Any
+
+import orjson
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+# Match Flask's DefaultJSONProvider output: sorted keys, non-str dict keys allowed,
+# and datetimes rendered as HTTP dates (handled in _default) rather than RFC 3339
+_ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _default(obj: Any) -> Any:
+    """Serialize the types Flask's default provider supports that orjson does not."""
+    if isinstance(obj, date):
+        return http_date(obj)
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson, used by jsonify() and request.get_json().
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS),
+            mimetype="application/json"
+        )
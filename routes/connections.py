@@ -1,11 +1,11 @@
 from flask import Blueprint, request, jsonify, g, current_app
-from typing import List, Optional
+from typing import Optional
 from datetime import datetime, timezone
 from infrastructure.clients import get_firestore_db
 import time
 from infrastructure.token_validator import verify_token, handle_all_errors, verify_app_check_token
 from infrastructure.logger import get_logger
-from infrastructure.adapters import extract_image_bytes_from_request
+from infrastructure.adapters import detect_image_format, extract_image_bytes_from_request, get_upload_size
 from services.connection_service import (
     get_user_connections,
     set_active_connection_firestore,
@@ -20,12 +20,12 @@ from services.connection_service import (
 )
 from services.connection_service import get_profile_text
 from utils.moderation import redact_flagged_sentences
+from services.spur_service import propagate_connection_name
 from services.storage_service import MAX_PROFILE_IMAGE_SIZE_BYTES, upload_profile_image
-from utils.ocr_utils import perform_ocr_on_screenshot as perform_ocr
+from utils.ocr_utils import perform_ocr_on_gcs_uris, perform_ocr_on_screenshots
 from utils.trait_manager import infer_personality_traits_from_openai_vision
 from PIL import Image
 import io
-import base64
 from werkzeug.datastructures import FileStorage
 from utils.usage_middleware import estimate_trait_inference_tokens
 from services.billing_service import check_user_usage_limit
@@ -36,15 +36,6 @@ connection_bp = Blueprint("connection", __name__)
 
 # Constants
 MAX_PROFILE_CONTENT_IMAGE_SIZE_BYTES = 10 * 1024 * 1024  # 10MB
-ALLOWED_CONTENT_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg'}
-
-
-def _allowed_content_image_file(filename: str) -> bool:
-    """Check if content image filename has allowed extension."""
-    if not filename:
-        return False
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_CONTENT_IMAGE_EXTENSIONS
 
 
 def _process_image_file(file_obj: FileStorage, max_size: int, 
@@ -55,7 +46,7 @@ def _process_image_file(file_obj: FileStorage, max_size: int,
     Args:
         file_obj: FileStorage object from Flask
         max_size: Maximum allowed file size in bytes
-        allowed_extensions: Set of allowed file extensions
+        allowed_extensions: Set of allowed image formats (e.g. {"png", "jpeg"}), matched by file signature
         
     Returns:
         Image bytes if valid, None otherwise
@@ -63,83 +54,26 @@ def _process_image_file(file_obj: FileStorage, max_size: int,
     if not file_obj or not file_obj.filename:
         return None
         
-    # Check extension
-    if not ('.' in file_obj.filename and 
-            file_obj.filename.rsplit('.', 1)[1].lower() in allowed_extensions):
-        logger.error(f"Invalid file extension: {file_obj.filename}")
+    # Reject oversized uploads before reading them into memory
+    upload_size = get_upload_size(file_obj)
+    if upload_size is not None and upload_size > max_size:
+        logger.error(f"Invalid file size: {upload_size} bytes")
         return None
     
-    # Read file
-    file_obj.seek(0)
+    # Read file once; a fresh FileStorage stream is already at position 0
     image_bytes = file_obj.read()
-    file_obj.seek(0)  # Reset for potential re-read
     
     # Check size
     if not image_bytes or len(image_bytes) > max_size:
         logger.error(f"Invalid file size: {len(image_bytes) if image_bytes else 0} bytes")
         return None
-        
-    return image_bytes
-
-
-def extract_image_bytes_from_request(field_name: str) -> List[bytes]:
-    """
-    Extract image bytes from request, handling both file uploads and base64 data.
     
-    Args:
-        field_name: Name of the form field containing images
+    # Check format from the file signature; filename extensions can't be trusted
+    if detect_image_format(image_bytes) not in allowed_extensions:
+        logger.error(f"Invalid file type: {file_obj.filename}")
+        return None
         
-    Returns:
-        List of image bytes
-    """
-    image_bytes_list = []
-    
-    # Check for file uploads
-    if field_name in request.files:
-        files = request.files.getlist(field_name)
-        for file_obj in files:
-            if file_obj and file_obj.filename:
-                file_obj.seek(0)
-                image_bytes = file_obj.read()
-                if image_bytes:
-                    image_bytes_list.append(image_bytes)
-    
-    # Check for base64 data in JSON
-    elif request.is_json:
-        data = request.get_json()
-        if data and field_name in data:
-            images_data = data.get(field_name, [])
-            if isinstance(images_data, list):
-                for img_data in images_data:
-                    try:
-                        # Handle base64 string
-                        if isinstance(img_data, str):
-                            if ',' in img_data and img_data.startswith('data:'):
-                                img_data = img_data.split(',', 1)[1]
-                            image_bytes = base64.b64decode(img_data)
-                            image_bytes_list.append(image_bytes)
-                        # Handle dict with 'data' field
-                        elif isinstance(img_data, dict) and 'data' in img_data:
-                            b64_data = img_data['data']
-                            if ',' in b64_data and b64_data.startswith('data:'):
-                                b64_data = b64_data.split(',', 1)[1]
-                            image_bytes = base64.b64decode(b64_data)
-                            image_bytes_list.append(image_bytes)
-                    except Exception as e:
-                        logger.error(f"Failed to decode base64 image: {e}")
-                        continue
-    elif field_name in request.form:
-        img_data = request.form.get(field_name)
-        if img_data:
-            try:
-                image_bytes = base64.b64decode(img_data)
-                image_bytes_list.append(image_bytes)
-
-            except Exception as e:
-                logger.error(f"Failed to decode base64 image: {e}")
-                
-
-    return image_bytes_list
+    return image_bytes
 
 
 @connection_bp.route("/connections/save", methods=["POST"])
@@ -218,20 +152,20 @@ def create_connection():
         profile_content_texts = []
         content_images = extract_image_bytes_from_request('profileContentImageBytes')
         
+        valid_content_images = []
         for image_bytes in content_images:
             if not image_bytes or len(image_bytes) > MAX_PROFILE_CONTENT_IMAGE_SIZE_BYTES:
                 logger.error(f"Skipping oversized content image for user {user_id}")
                 continue
+            valid_content_images.append(image_bytes)
                 
-            try:
-                # Verify it's a profile content image
-                # Note: classify_image needs to accept bytes, not FileStorage
-                # You may need to update classify_image accordingly
-                extracted_text = perform_ocr(image_bytes)
+        try:
+            # OCR all content images in batched Vision requests
+            for extracted_text in perform_ocr_on_screenshots(valid_content_images):
                 if extracted_text:
-                    profile_content_texts.extend(extracted_text)  # perform_ocr returns a list
-            except Exception as e:
-                logger.error(f"Error processing content image for user {user_id}: {e}", exc_info=True)
+                    profile_content_texts.extend(extracted_text)  # each OCR result is a list of text blocks
+        except Exception as e:
+            logger.error(f"Error processing content images for user {user_id}: {e}", exc_info=True)
 
         # Process profile pictures (personality traits)
         personality_traits = []
@@ -328,17 +262,18 @@ def update_connection():
             profile_content_texts = []
             content_images = extract_image_bytes_from_request('connectionProfileContent')
             
-            for image_bytes in content_images:
-                if not image_bytes or len(image_bytes) > MAX_PROFILE_CONTENT_IMAGE_SIZE_BYTES:
-                    continue
+            valid_content_images = [
+                image_bytes for image_bytes in content_images
+                if image_bytes and len(image_bytes) <= MAX_PROFILE_CONTENT_IMAGE_SIZE_BYTES
+            ]
                     
-                try:
-                    extracted_text = perform_ocr(image_bytes)
+            try:
+                for extracted_text in perform_ocr_on_screenshots(valid_content_images):
                     if extracted_text:
                         
                         profile_content_texts.extend(extracted_text)
-                except Exception as e:
-                    logger.error(f"Error processing content image: {e}", exc_info=True)
+            except Exception as e:
+                logger.error(f"Error processing content images: {e}", exc_info=True)
 
         # Process profile pictures if provided
         personality_traits = None
@@ -385,6 +320,10 @@ def update_connection():
             updated_personality_traits=personality_traits,
             updated_profile_pic_url=form_data.get("connection_profile_pic_url")
         )
+
+        # Saved spurs store connection_name; refresh them off the request path on rename
+        if "connection_name" in result.get("updated_fields", []):
+            propagate_connection_name(user_id, connection_id, name)
         
         return jsonify(result)
         
@@ -754,13 +693,19 @@ def upload_face_photo():
         if not face_photo_file or not face_photo_file.filename:
             return jsonify({"error": "Invalid face photo file"}), 400
 
-        # Read the image data
-        face_photo_file.seek(0)
-        image_bytes = face_photo_file.read()
-        
-        if not image_bytes or len(image_bytes) > MAX_PROFILE_IMAGE_SIZE_BYTES:
+        # Reject oversized uploads before reading them into memory
+        upload_size = get_upload_size(face_photo_file)
+        if upload_size is not None and upload_size > MAX_PROFILE_IMAGE_SIZE_BYTES:
             return jsonify({"error": "Face photo is too large or empty"}), 400
 
+        # With a known size the upload streams straight to GCS; otherwise read it in
+        image_bytes = None
+        if not upload_size:
+            image_bytes = face_photo_file.read()
+            
+            if not image_bytes or len(image_bytes) > MAX_PROFILE_IMAGE_SIZE_BYTES:
+                return jsonify({"error": "Face photo is too large or empty"}), 400
+
         # Upload to storage
         try:
             # Generate filename
@@ -773,7 +718,9 @@ def upload_face_photo():
                 connection_id=connection_id,
                 image_bytes=image_bytes,
                 original_filename=filename,
-                content_type="image/jpeg"
+                content_type="image/jpeg",
+                image_stream=face_photo_file.stream if upload_size else None,
+                content_length=upload_size
             )
             
             # Update connection profile with photo URL
@@ -920,6 +867,7 @@ def create_connection_with_photos():
     - connection_context_block (text)
     - connection_face_photo_url (text, optional)
     - ocr_images[] (files)
+    - profileContentImageUris[] (text, optional): gs:// URIs of OCR images already in Cloud Storage
     - profile_images[] (files)
     """
     user_id = getattr(g, "user_id", None)
@@ -946,9 +894,15 @@ def create_connection_with_photos():
     try:
         ocr_image_bytes = extract_image_bytes_from_request('profileContentImageBytes')
         connection_profile_text = []
-        for image_bytes in ocr_image_bytes:
-            # Process each OCR image
-            result = perform_ocr(image_bytes)
+        # Process all OCR images in batched Vision requests
+        for result in perform_ocr_on_screenshots(ocr_image_bytes):
+            connection_profile_text.extend(result)
+        
+        # Screenshots the client already uploaded to GCS are read by Vision directly;
+        # only objects under the caller's own prefix in the app bucket are accepted
+        user_gcs_prefix = f"gs://{current_app.config.get('GCS_PROFILE_PICS_BUCKET')}/users/{user_id}/"
+        ocr_image_uris = [uri for uri in request.form.getlist('profileContentImageUris') if uri.startswith(user_gcs_prefix)]
+        for result in perform_ocr_on_gcs_uris(ocr_image_uris):
             connection_profile_text.extend(result)
 
     except Exception as e:
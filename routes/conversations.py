@@ -1,13 +1,14 @@
 # routes/conversations.py
 from datetime import datetime
-from flask import Blueprint, request, jsonify, g
+from flask import Blueprint, Response, current_app, request, jsonify, g, stream_with_context
 from infrastructure.token_validator import verify_token, handle_all_errors, verify_app_check_token
 from infrastructure.logger import get_logger
-from class_defs.spur_def import Spur
 from class_defs.conversation_def import Conversation
-from services.spur_service import save_spur, delete_saved_spur, get_saved_spurs
+from services.spur_service import get_saved_spurs
 from services.storage_service import (
     get_conversations,
+    get_conversations_page,
+    iter_conversations,
     save_conversation,
     get_conversation,
     delete_conversation,
@@ -45,6 +46,36 @@ def get_conversations_bp():
                 return jsonify({'error': f"{err_point} - Error: {str(e)}"}), 400
 
 
+    # Paged mode: resume from the previous page's cursor instead of re-scanning it
+    page_size = request.args.get("page_size", type=int)
+    cursor = request.args.get("cursor")
+    if page_size or cursor:
+        if page_size:
+            filters["limit"] = page_size
+        if cursor:
+            filters["cursor"] = cursor
+        try:
+            page = get_conversations_page(user_id, filters)
+        except ValueError as e:
+            err_point = __package__ or __name__
+            logger.error("[%s] Error: %s", err_point, e)
+            return jsonify({'error': f"{err_point} - Error: invalid cursor"}), 400
+        return jsonify(page)
+
+    if request.args.get("format") == "ndjson":
+        # One JSON object per line, written as documents stream in from Firestore
+        conversations = iter_conversations(user_id, filters)
+
+        def generate():
+            try:
+                for conversation in conversations:
+                    yield current_app.json.dumps(conversation) + "\n"
+            except Exception as e:
+                err_point = __package__ or __name__
+                logger.error("[%s] Error streaming conversations for user %s: %s", err_point, user_id, e, exc_info=True)
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
     result = get_conversations(user_id, filters)
     return jsonify(result)
 
@@ -156,57 +187,3 @@ def fetch_saved_spurs_bp():
 
     result = get_saved_spurs(user_id)
     return jsonify(result)
-
-@conversations_bp.route("/save-spur", methods=["POST"])
-@handle_all_errors
-@verify_token
-@verify_app_check_token
-def save_spur_bp():
-
-    user_id = getattr(g, "user_id", None)
-    if not user_id:
-        err_point = __package__ or __name__
-        logger.error(f"Error: {err_point}")
-        return jsonify({'error': f"[{err_point}] - Error:"}), 400
-
-    data = request.get_json()
-    if not data or 'spur' not in data:
-        err_point = __package__ or __name__
-        logger.error(f"Error: {err_point} - No spur provided")
-        return jsonify({'error': f"[{err_point}] - No spur provided"}), 400
-    spur_dict = data['spur']
-    if not isinstance(spur_dict, dict):
-        err_point = __package__ or __name__
-        logger.error(f"Error: {err_point} - Invalid spur format")
-        return jsonify({'error': f"[{err_point}] - Invalid spur format"}), 400
-    spur = Spur.from_dict(spur_dict)
-
-    result = save_spur(user_id, spur_dict)
-    return jsonify(result)
-
-
-@conversations_bp.route("/delete-spur", methods=["DELETE"])
-@handle_all_errors
-@verify_token
-@verify_app_check_token
-def delete_saved_spurs_bp(spur_id):
-    user_id = getattr(g, "user_id", None)
-    if not user_id:
-        err_point = __package__ or __name__
-        logger.error(f"Error: {err_point}")
-        return jsonify({'error': f"[{err_point}] - Error:"}), 400
-    
-    data = request.get_json()
-    if not data or 'spur_id' not in data:
-        err_point = __package__ or __name__
-        logger.error(f"Error: {err_point} - No spur_id provided")
-        return jsonify({'error': f"[{err_point}] - No spur_id provided"}), 400
-    spur_id = data['spur_id']
-    if not spur_id:
-        err_point = __package__ or __name__
-        logger.error(f"Error: {err_point} - spur_id is required")
-        return jsonify({'error': f"[{err_point}] - spur_id is required"}), 400
-
-
-    result = delete_saved_spur(user_id, spur_id)
-    return jsonify(result)
\ No newline at end of file
@@ -1,11 +1,13 @@
 from flask import Blueprint, request, jsonify, g
 from infrastructure.token_validator import verify_token, handle_all_errors, verify_app_check_token
 from infrastructure.logger import get_logger
+from infrastructure.adapters import detect_image_format
 from infrastructure.id_generator import generate_conversation_id
 from services.connection_service import get_active_connection_firestore
 from services.gpt_service import get_spurs_for_output
 from class_defs.conversation_def import Conversation
-from services.storage_service import ConversationStorage
+from datetime import datetime, timezone
+from services.storage_service import save_conversation
 from utils.usage_middleware import estimate_spur_generation_tokens
 import json
 
@@ -76,9 +78,12 @@ def generate():
         convo_files = request.files.getlist('conversation_images')
         logger.info(f"Received {len(convo_files)} conversation images")
         for idx, image_file in enumerate(convo_files):
-            if image_file and image_file.filename and allowed_file(image_file.filename):
+            if image_file and image_file.filename:
                 try:
                     image_data = image_file.read()
+                    if not allowed_file(image_data):
+                        logger.error(f"Skipping conversation image {idx} with unsupported format")
+                        continue
                     conversation_images.append({
                         'filename': image_file.filename or f'convo_{idx}.jpg',
                         'bytes': image_data,
@@ -94,9 +99,12 @@ def generate():
         profile_files = request.files.getlist('profile_images')
         logger.info(f"Received {len(profile_files)} profile images")
         for idx, image_file in enumerate(profile_files):
-            if image_file and image_file.filename and allowed_file(image_file.filename):
+            if image_file and image_file.filename:
                 try:
                     image_data = image_file.read()
+                    if not allowed_file(image_data):
+                        logger.error(f"Skipping profile image {idx} with unsupported format")
+                        continue
                     profile_images.append({
                         'filename': image_file.filename or f'profile_{idx}.jpg',
                         'bytes': image_data,
@@ -142,20 +150,18 @@ def generate():
         if not conversation_id or conversation_id.strip() == "":
             conversation_id = generate_conversation_id(user_id)
         
-        conversation_dict = {
-            "user_id": user_id,
-            "conversation_id": conversation_id,
-            "connection_id": connection_id,
-            "conversation": conversation_messages,
-        }
-        if situation and situation.strip() != "":
-            conversation_dict["situation"] = situation
-        if topic and topic.strip() != "":
-            conversation_dict["topic"] = topic
-            
-        conversation_obj = Conversation.from_dict(conversation_dict)
-        storage = ConversationStorage()
-        storage.save_conversation(conversation=conversation_obj)
+        # Built directly rather than via a dict and from_dict, and saved through
+        # the shared storage instance
+        conversation_obj = Conversation(
+            user_id=user_id,
+            conversation_id=conversation_id,
+            created_at=datetime.now(timezone.utc),
+            conversation=conversation_messages,
+            connection_id=connection_id,
+            situation=situation if situation and situation.strip() != "" else None,
+            topic=topic if topic and topic.strip() != "" else None,
+        )
+        save_conversation(conversation_obj)
 
 
     # Generate spurs with categorized images
@@ -180,11 +186,10 @@ def generate():
     })
 
 
-def allowed_file(filename: str) -> bool:
-    """Check if the file extension is allowed."""
-    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+def allowed_file(image_data: bytes) -> bool:
+    """Check if the file content is an allowed image format (by signature, not extension)."""
+    ALLOWED_FORMATS = {'png', 'jpeg', 'gif', 'webp'}
+    return detect_image_format(image_data) in ALLOWED_FORMATS
 
 
 # Optional: Function to save images to storage (Firebase, S3, etc.)
@@ -1,7 +1,8 @@
-from flask import Blueprint, request, jsonify, g, current_app
+import queue
+from flask import Blueprint, Response, request, jsonify, g, current_app, stream_with_context
 from infrastructure.token_validator import verify_token, handle_all_errors, verify_app_check_token
 from infrastructure.logger import get_logger
-from services.spur_service import get_spur, get_saved_spurs, delete_saved_spur, save_spur
+from services.spur_service import get_spur, get_spurs, get_saved_spurs, get_saved_spurs_page, iter_saved_spurs, delete_saved_spur, save_spur, save_spur_buffered, save_spurs_bulk
 
 
 
@@ -9,6 +10,9 @@ logger = get_logger(__name__)
 
 spurs_bp = Blueprint("spurs", __name__)
 
+DEFAULT_SPURS_PAGE_SIZE = 50
+MAX_SPURS_PAGE_SIZE = 200
+
 @spurs_bp.route("/get-spurs", methods=["GET"])
 @handle_all_errors
 @verify_token
@@ -20,7 +24,35 @@ def fetch_saved_spurs_bp():
             user_id = current_app.config.get("user_id", None)
             if not user_id:
                 return jsonify({"error": "Authentication error"}), 401
+
+    page_size = request.args.get("page_size", type=int)
+    cursor = request.args.get("cursor")
+    filters = {field: request.args.get(field) for field in ("variant", "situation", "keyword") if request.args.get(field)}
+    if page_size or cursor or filters:
+        page_size = min(max(page_size or DEFAULT_SPURS_PAGE_SIZE, 1), MAX_SPURS_PAGE_SIZE)
+        try:
+            page = get_saved_spurs_page(user_id, page_size=page_size, cursor=cursor, filters=filters)
+        except ValueError as e:
+            err_point = __package__ or __name__
+            logger.error(f"Error: {err_point} - {e}")
+            return jsonify({'error': f"[{err_point}] - Error: {e}"}), 400
+        return jsonify({
+            "items": [spur.to_dict() for spur in page["items"]],
+            "next_cursor": page["next_cursor"],
+        })
     
+    if request.args.get("format") == "ndjson":
+        # One JSON object per line, written as documents stream in from Firestore
+        def generate():
+            try:
+                for spur in iter_saved_spurs(user_id):
+                    yield current_app.json.dumps(spur.to_dict()) + "\n"
+            except Exception as e:
+                err_point = __package__ or __name__
+                logger.error("[%s] Error streaming spurs for user %s: %s", err_point, user_id, e, exc_info=True)
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
     spurs_list = get_saved_spurs(user_id)
     
     spurs_data = []
@@ -77,10 +109,45 @@ def save_spur_bp():
     
     
 
+    if request.args.get("buffered") == "true":
+        # Respond once queued; the spur is committed in the next background batch
+        try:
+            save_spur_buffered(user_id, data)
+        except (ValueError, queue.Full) as e:
+            err_point = __package__ or __name__
+            logger.error(f"Error: {err_point} - {e}")
+            return jsonify({'error': f"[{err_point}] - Error: {str(e)}"}), 400 if isinstance(e, ValueError) else 503
+        return jsonify({"success": "spur queued", "spur_id": data["spur_id"]}), 202
+
     result = save_spur(user_id, data)
     return jsonify(result)
 
 
+
+@spurs_bp.route("/save-spurs", methods=["POST"])
+@handle_all_errors
+@verify_token
+@verify_app_check_token
+def save_spurs_bulk_bp():
+    data = request.get_json()
+    user_id = getattr(g, "user_id", None)
+    if not user_id:
+        user_id = data.get("user_id", None)
+        if not user_id:
+            user_id = current_app.config.get("user_id", None)
+            if not user_id:
+                return jsonify({"error": "Authentication error"}), 401
+
+    spurs = data.get("spurs")
+    if not spurs or not isinstance(spurs, list):
+        err_point = __package__ or __name__
+        logger.error(f"Error: {err_point}")
+        return jsonify({'error': f"[{err_point}] - Error: spurs list is required"}), 400
+
+    result = save_spurs_bulk(user_id, spurs)
+    return jsonify(result)
+
+
 @spurs_bp.route("/delete-spur", methods=["DELETE"])
 @handle_all_errors
 @verify_token
@@ -120,4 +187,29 @@ def get_spur_bp(spur_id):
         logger.error(f"Error: {err_point}")
         return jsonify({'error': f"[{err_point}] - Error: spur_id is required"}), 400
     result = get_spur(spur_id)
-    return jsonify(result)
\ No newline at end of file
+    return jsonify(result)
+
+
+@spurs_bp.route("/get-spurs-by-id", methods=["POST"])
+@handle_all_errors
+@verify_token
+@verify_app_check_token
+def get_spurs_by_id_bp():
+    user_id = getattr(g, "user_id", None)
+    if not user_id:
+        user_id = current_app.config.get("user_id", None)
+        if not user_id:
+            return jsonify({"error": "Authentication error"}), 401
+
+    data = request.get_json() or {}
+    spur_ids = data.get("spur_ids")
+    if not spur_ids or not isinstance(spur_ids, list):
+        err_point = __package__ or __name__
+        logger.error(f"Error: {err_point}")
+        return jsonify({'error': f"[{err_point}] - Error: spur_ids list is required"}), 400
+
+    # Only return spurs owned by the caller
+    delimiter = current_app.config['ID_DELIMITER']
+    owned_ids = [sid for sid in spur_ids if isinstance(sid, str) and sid.partition(delimiter)[0] == user_id]
+    spurs_list = get_spurs(owned_ids)
+    return jsonify([spur.to_dict() for spur in spurs_list])
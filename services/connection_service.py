@@ -3,6 +3,8 @@ from dataclasses import fields
 from flask import current_app, json
 import base64
 import json
+import threading
+from cachetools import TTLCache
 from typing import List, Dict, Optional, Any
 from openai.types.chat import ChatCompletionMessageParam
 from infrastructure.logger import get_logger
@@ -15,6 +17,16 @@ from utils.trait_manager import downscale_image_from_bytes, extract_json_block
 
 logger = get_logger(__name__)
 
+# connection_name by (user_id, connection_id), so saving spurs doesn't re-read the
+# connection document each time; dropped whenever the connection is written
+CONNECTION_NAME_CACHE_TTL_SECONDS = 300
+_connection_name_cache = TTLCache(maxsize=5000, ttl=CONNECTION_NAME_CACHE_TTL_SECONDS)
+_connection_name_cache_lock = threading.Lock()
+
+def _invalidate_connection_name(user_id: str, connection_id: str) -> None:
+    with _connection_name_cache_lock:
+        _connection_name_cache.pop((user_id, connection_id), None)
+
 def _join_ocr_subwords(subwords: List[str]) -> str:
     """Joins OCR subwords into a coherent string, handling spaces appropriately."""
     no_space_before = {".", ",", "!", "?", ":", ";", ")", "]", "}", "%"}
@@ -173,6 +185,7 @@ def save_connection_profile(connection_profile: ConnectionProfile) -> dict:
     try:
         db = get_firestore_db()  # Ensure Firestore client is initialized
         db.collection("users").document(user_id).collection("connections").document(connection_id).set(connection_profile_dict)
+        _invalidate_connection_name(user_id, connection_id)
         logger.error(f"LOG.INFO: Connection profile {connection_id} for user {user_id} saved successfully.")
         return {
             "success": "connection profile successfully saved"
@@ -307,6 +320,32 @@ def get_connection_profile(user_id: str, connection_id: str) -> Optional[Connect
         logger.error("[%s] Error getting conn profile (user %s, conn %s): %s", "conn_service", user_id, connection_id, e, exc_info=True)
         raise ConnectionError(f"Could not retrieve connection profile: {str(e)}") from e
 
+def get_connection_name(user_id: str, connection_id: str) -> Optional[str]:
+    """
+    Returns a connection's name, served from a short-lived cache when possible.
+
+    Args:
+        user_id: ID of the user who owns the connection
+            str
+        connection_id: ID of the connection
+            str
+    Return
+        connection_name, or None if the connection does not exist
+            Optional[str]
+    """
+    key = (user_id, connection_id)
+    with _connection_name_cache_lock:
+        if key in _connection_name_cache:
+            return _connection_name_cache[key]
+
+    connection = get_connection_profile(user_id, connection_id)
+    if not connection:
+        return None
+    connection_name = ConnectionProfile.get_attr_as_str(connection, "connection_name")
+    with _connection_name_cache_lock:
+        _connection_name_cache[key] = connection_name
+    return connection_name
+
 def update_connection_profile(
     user_id: str, 
     connection_id: str, 
@@ -369,8 +408,9 @@ def update_connection_profile(
             return {"warning": "no effective update data provided for connection profile", "connection_id": connection_id}
 
         doc_ref.update(update_payload)
+        _invalidate_connection_name(user_id, connection_id)
         logger.error(f"LOG.INFO: Conn profile {connection_id} for user {user_id} updated with keys: {list(update_payload.keys())}.")
-        return {"success": "connection profile updated", "connection_id": connection_id}
+        return {"success": "connection profile updated", "connection_id": connection_id, "updated_fields": list(update_payload.keys())}
     except Exception as e:
         logger.error(f"Error updating conn profile {connection_id} for user {user_id}: {e}", exc_info=True)
         return {"error": f"Cannot update connection profile: {str(e)}"}
@@ -390,6 +430,7 @@ def delete_connection_profile(user_id: str, connection_id:str) -> dict:
             return {"warning": "connection profile not found, no action taken", "connection_id": connection_id}
 
         doc_ref.delete()
+        _invalidate_connection_name(user_id, connection_id)
         logger.error(f"LOG.INFO: Conn profile {connection_id} for user {user_id} deleted successfully.")
         # TODO: Delete associated images off firebase storage. 
         return {"success": "connection profile deleted", "connection_id": connection_id}
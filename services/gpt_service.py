@@ -1,4 +1,6 @@
 import base64
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from flask import current_app
 import openai
@@ -10,7 +12,7 @@ from infrastructure.clients import get_openai_client
 from infrastructure.id_generator import generate_spur_id, get_null_connection_id, generate_conversation_id
 from services.connection_service import get_connection_profile, get_active_connection_firestore, trending_topics_matching_connection_interests
 from services.user_service import get_user
-from services.topic_service import get_random_trending_topic, refresh_if_stale
+from services.topic_service import get_random_trending_topic, refresh_in_background
 from utils.gpt_output import parse_gpt_output
 from utils.prompt_template import build_prompt, get_system_prompt
 from utils.trait_manager import infer_tone, infer_situation, analyze_convo_for_context, downscale_image_from_bytes, extract_json_block
@@ -20,6 +22,33 @@ from utils.usage_tracker import track_openai_usage, track_openai_usage_manual, e
 
 logger = get_logger(__name__)
 
+# Background pool for Firestore/OpenAI lookups that can overlap with prompt assembly
+_prefetch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gpt-prefetch")
+
+def _submit_with_app_context(func, *args):
+    """
+    Submits func to the prefetch pool, running it inside the current Flask app context
+    so helpers that read current_app.config keep working off the request thread.
+    """
+    app = current_app._get_current_object()
+
+    def _run():
+        with app.app_context():
+            return func(*args)
+
+    return _prefetch_executor.submit(_run)
+
+def _get_cold_open_topics() -> tuple:
+    """
+    Schedules a refresh of the trending topic pool if stale and draws two random topics
+    for a cold open from the current pool.
+
+    Returns:
+        tuple: (cold_open_topic_one, cold_open_topic_two), either of which may be None.
+    """
+    refresh_in_background()
+    return get_random_trending_topic(), get_random_trending_topic()
+
 def get_user_profile_for_prompt(user_id: str) -> Dict:
     """
     Retrieves the user profile for prompt generation.
@@ -115,6 +144,34 @@ def merge_spurs(original_spurs: list, regenerated_spurs: list) -> list:
 
     return merged_spurs
 
+def prepare_image_parts(images: Optional[List[Dict]], image_kind: str) -> List[Dict]:
+    """
+    Downscales images and converts them to OpenAI image_url content parts.
+
+    Args:
+        images (list[dict], optional): List of images with 'bytes' (raw bytes of image).
+        image_kind (str): Label used in log messages (e.g., "conversation", "profile").
+
+    Returns:
+        list[dict]: List of image_url content parts with base64-encoded JPEG data URLs.
+    """
+    image_parts = []
+    for image_data in images or []:
+        image_bytes = image_data.get("bytes")
+        if not image_bytes:
+            logger.error(f"Skipping {image_kind} image due to missing bytes.")
+            continue
+
+        resized_image_bytes = downscale_image_from_bytes(image_bytes, max_dim=1024)
+        base64_image = base64.b64encode(resized_image_bytes).decode("utf-8")
+        image_parts.append({
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:image/jpeg;base64,{base64_image}"
+            }
+        })
+    return image_parts
+
 @track_openai_usage('spur_generation')
 def generate_spurs(
     user_id: str,
@@ -125,7 +182,9 @@ def generate_spurs(
     selected_spurs: Optional[list[str]] = None,
     conversation_messages: Optional[List[Dict]] = None,
     conversation_images: Optional[List[Dict]] = None,  
-    profile_images: Optional[List[Dict]] = None
+    profile_images: Optional[List[Dict]] = None,
+    prepared_conversation_images: Optional[List[Dict]] = None,
+    prepared_profile_images: Optional[List[Dict]] = None
 ) -> list:
     """
     Generates spur responses based on the provided conversation context and profiles.
@@ -140,6 +199,8 @@ def generate_spurs(
         conversation_messages (list[dict], optional): List of conversation messages.
         conversation_images (list[dict], optional): List of images with 'data' (raw bytes of image), 'filename', and 'mime_type'.
         profile_images (list[dict], optional): List of profile images with 'data' (raw bytes of image), 'filename', and 'mime_type'.
+        prepared_conversation_images (list[dict], optional): Conversation image parts already built by prepare_image_parts; skips re-encoding.
+        prepared_profile_images (list[dict], optional): Profile image parts already built by prepare_image_parts; skips re-encoding.
 
     Returns:
         List of generated Spur objects.
@@ -148,6 +209,13 @@ def generate_spurs(
     if not user:
         raise ValueError(f"User with ID {user_id} not found")
     user_profile_dict = user.to_dict()
+
+    # Trending topics are only used for a cold open; start the interest-matching lookup
+    # now so it overlaps with the connection profile fetches and prompt assembly below.
+    # Random cold-open topics are drawn later, only if no match comes back.
+    matching_topics_future = None
+    if user.isUsingTrendingTopics() and ((not conversation_messages or len(conversation_messages) == 0) and (not conversation_images or len(conversation_images) == 0) and (not profile_images or len(profile_images) == 0) and (not topic or topic.strip() == "")):
+        matching_topics_future = _submit_with_app_context(trending_topics_matching_connection_interests, user_id, connection_id)
     
     user_spurs_list = user_profile_dict.get('selected_spurs', [])
     if selected_spurs and len(selected_spurs) > 0:
@@ -278,8 +346,8 @@ def generate_spurs(
     if not some_context:
         context_block += f"\n*** INSTRUCTIONS: Please generate a set of SPURs suggested for the User to say to the Connection. Using the User Profile Context as a guide for the role you're assisting with here, suggest SPURs for the User to say to a Connection. Your fundamental goal here is to help the User engage with and grow the Connection's interest in and desire for the User. \n"
     
-    if user.isUsingTrendingTopics() and ((not conversation_messages or len(conversation_messages) == 0) and (not conversation_images or len(conversation_images) == 0) and (not profile_images or len(profile_images) == 0) and (not topic or topic.strip() == "")):
-        matching_trending_topics = trending_topics_matching_connection_interests(user_id, connection_id)
+    if matching_topics_future:
+        matching_trending_topics = matching_topics_future.result()
         if matching_trending_topics and len(matching_trending_topics) > 0:
             context_block += "(Note: No conversation messages, images, or topic provided. Here, you should:\n"
             i = 0
@@ -297,9 +365,7 @@ def generate_spurs(
                 context_block += "."
             context_block += ")\n"
         elif (not connection_context_block or connection_context_block.strip() == "") and (not connection_profile_text or len(connection_profile_text) == 0):
-            refresh_if_stale()
-            cold_open_topic_one = get_random_trending_topic()
-            cold_open_topic_two = get_random_trending_topic()
+            cold_open_topic_one, cold_open_topic_two = _get_cold_open_topics()
             if cold_open_topic_one:
                 logger.error(f"No topic or messages provided, using trending topic: {cold_open_topic_one}")
             else:
@@ -326,37 +392,13 @@ def generate_spurs(
     openai_client = get_openai_client()
     system_prompt = get_system_prompt()
     
-    conversation_image_parts = []
-    for image_data in conversation_images or []:
-        image_bytes = image_data.get("bytes")
-        if not image_bytes:
-            logger.error("Skipping conversation image due to missing bytes.")
-            continue
-
-        resized_image_bytes = downscale_image_from_bytes(image_bytes, max_dim=1024)
-        base64_image = base64.b64encode(resized_image_bytes).decode("utf-8")
-        conversation_image_parts.append({
-            "type": "image_url",
-            "image_url": {
-                "url": f"data:image/jpeg;base64,{base64_image}"
-            }
-        })
-    
-    profile_image_parts = []
-    for image_data in profile_images or []:
-        image_bytes = image_data.get("bytes")
-        if not image_bytes:
-            logger.error("Skipping profile image due to missing bytes.")
-            continue
+    conversation_image_parts = prepared_conversation_images
+    if conversation_image_parts is None:
+        conversation_image_parts = prepare_image_parts(conversation_images, "conversation")
 
-        resized_image_bytes = downscale_image_from_bytes(image_bytes, max_dim=1024)
-        base64_image = base64.b64encode(resized_image_bytes).decode("utf-8")
-        profile_image_parts.append({
-            "type": "image_url",
-            "image_url": {
-                "url": f"data:image/jpeg;base64,{base64_image}"
-            }
-        })
+    profile_image_parts = prepared_profile_images
+    if profile_image_parts is None:
+        profile_image_parts = prepare_image_parts(profile_images, "profile")
     
     if not openai_client:
         logger.error("OpenAI client not initialized. Cannot generate spurs. Error at gpt_service.py:generate_spurs")
@@ -473,9 +515,11 @@ def generate_spurs(
             if attempt == 2:
                  logger.error(f"Final GPT attempt failed for user {user_id} due to API error.", exc_info=True)
         except Exception as e:
-            logger.error(f"[Attempt {attempt+1}] GPT generation failed for user {user_id} — Error: {e}", exc_info=True)
+            # Traceback is captured only once, on the final attempt
             if attempt == 2:
-                logger.error(f"Final GPT attempt failed for user {user_id} — returning fallback.")
+                logger.error(f"Final GPT attempt failed for user {user_id} — returning fallback. Error: {e}", exc_info=True)
+            else:
+                logger.warning("[Attempt %d] GPT generation failed for user %s — Error: %r", attempt + 1, user_id, e)
     
     logger.error(f"All GPT generation attempts failed for user {user_id}.")
     return []
@@ -512,6 +556,10 @@ def get_spurs_for_output(
         raise ValueError(f"User with ID {user_id} not found")
     selected_spurs_from_profile = user_profile.to_dict().get("selected_spurs", [])
 
+    # Downscale and encode images once; every regeneration pass reuses the same parts
+    prepared_conversation_images = prepare_image_parts(conversation_images, "conversation")
+    prepared_profile_images = prepare_image_parts(profile_images, "profile")
+
     # Initial generation
     spurs = generate_spurs(
         user_id, 
@@ -522,7 +570,9 @@ def get_spurs_for_output(
         selected_spurs_from_profile,
         conversation_messages=conversation_messages,
         conversation_images=conversation_images,
-        profile_images=profile_images
+        profile_images=profile_images,
+        prepared_conversation_images=prepared_conversation_images,
+        prepared_profile_images=prepared_profile_images
     )
 
     counter = 0
@@ -533,7 +583,8 @@ def get_spurs_for_output(
 
     while spurs_needing_regeneration and counter < max_iterations:
         counter += 1
-        logger.error(f"LOG.INFO: Regeneration attempt {counter} for user {user_id}, variants: {spurs_needing_regeneration}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Regeneration attempt %d for user %s, variants: %s", counter, user_id, spurs_needing_regeneration)
         
         fixed_spurs = generate_spurs(
             user_id, 
@@ -544,7 +595,9 @@ def get_spurs_for_output(
             spurs_needing_regeneration,
             conversation_messages=conversation_messages,
             conversation_images=conversation_images,
-            profile_images=profile_images  # Pass images for regeneration too
+            profile_images=profile_images,  # Pass images for regeneration too
+            prepared_conversation_images=prepared_conversation_images,
+            prepared_profile_images=prepared_profile_images
         )
         spurs = merge_spurs(spurs, fixed_spurs)
         spurs_needing_regeneration = spurs_to_regenerate(spurs)
@@ -1,161 +1,546 @@
-from dataclasses import fields
-from datetime import datetime, timezone
+import atexit
+import base64
+import json
+import queue
+import re
+import threading
+from cachetools import TTLCache
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, fields
+from datetime import datetime
+from flask import current_app
+from google.api_core.exceptions import AlreadyExists, GoogleAPICallError
+from google.cloud import firestore
+from typing import Iterator, Optional
 from class_defs.spur_def import Spur
-from class_defs.profile_def import ConnectionProfile
 from infrastructure.clients import get_firestore_db
 from infrastructure.id_generator import extract_user_id_from_other_id
 from infrastructure.logger import get_logger
 from infrastructure.id_generator import generate_spur_id, get_null_connection_id
-from services.connection_service import get_connection_profile
+from services.connection_service import get_connection_name
 
 logger = get_logger(__name__)
 
-def save_spur(user_id, spur: dict) -> dict:
+# Canonical field set of a stored spur document; also the read projection, so
+# listings only transfer these fields
+_SPUR_FIELDS = (
+    "user_id", "spur_id", "conversation_id", "connection_id", "connection_name",
+    "situation", "topic", "variant", "tone", "text", "created_at",
+)
+
+# (name, default_factory or None) for each Spur field, resolved once instead of per document
+_SPUR_FIELD_SPECS = tuple(
+    (f.name, f.default_factory if callable(f.default_factory) else None) for f in fields(Spur)
+)
+_SPUR_FIELD_NAMES = frozenset(name for name, _ in _SPUR_FIELD_SPECS)
+# Fields without a factory default to None and can share one template; factory fields
+# (mutable defaults) are rebuilt per document
+_SPUR_DEFAULTS = dict.fromkeys(name for name, default_factory in _SPUR_FIELD_SPECS if not default_factory)
+_SPUR_FACTORY_FIELDS = tuple((name, default_factory) for name, default_factory in _SPUR_FIELD_SPECS if default_factory)
+
+# Filters get_saved_spurs_page pushes down to Firestore; see firestore.indexes.json
+SPUR_FILTER_FIELDS = ("variant", "situation", "keyword")
+MAX_SPUR_KEYWORDS = 100
+_KEYWORD_PATTERN = re.compile(r"\w+")
+
+# Firestore caps a single batched write at 500 mutations
+FIRESTORE_BATCH_LIMIT = 500
+
+# Concurrent single-document writes; throughput gains flatten out around 40 in-flight RPCs
+SPUR_WRITE_WORKERS = 40
+_spur_write_executor = ThreadPoolExecutor(max_workers=SPUR_WRITE_WORKERS, thread_name_prefix="spur-write")
+
+# Buffered writes: save_spur_buffered enqueues, one background thread commits batches
+SPUR_WRITE_QUEUE_SIZE = 10000
+SPUR_FLUSH_INTERVAL_SECONDS = 0.05
+_spur_write_queue = queue.Queue(maxsize=SPUR_WRITE_QUEUE_SIZE)
+_spur_flusher_thread = None
+_spur_flusher_lock = threading.Lock()
+
+# Short-lived read caches; entries for a user are dropped whenever their spurs are written
+SPUR_CACHE_TTL_SECONDS = 60
+_spur_cache = TTLCache(maxsize=10000, ttl=SPUR_CACHE_TTL_SECONDS)
+_spur_page_cache = TTLCache(maxsize=1024, ttl=SPUR_CACHE_TTL_SECONDS)
+_spur_cache_lock = threading.Lock()
+
+def _invalidate_spur_cache(user_id: str, spur_ids=()):
+    """ Drops cached spurs for spur_ids and every cached saved-spurs page for user_id. """
+    with _spur_cache_lock:
+        for spur_id in spur_ids:
+            _spur_cache.pop(spur_id, None)
+        for key in [key for key in _spur_page_cache.keys() if key[0] == user_id]:
+            _spur_page_cache.pop(key, None)
+
+def _spur_keywords(text: str) -> list[str]:
+    """
+    Returns the distinct lowercase words of a spur's text (first 100), stored on the
+    document so keyword search can use an array_contains query.
+    """
+    words = dict.fromkeys(_KEYWORD_PATTERN.findall(str(text).lower()))
+    return list(words)[:MAX_SPUR_KEYWORDS]
+
+def _spurs_collection(user_id: str):
+    """
+    Returns the spurs subcollection for a user on the shared, process-wide Firestore
+    client, so every call reuses the same gRPC channel and credentials.
+    """
+    return get_firestore_db().collection("users").document(user_id).collection("spurs")
+
+def _build_spur_doc(user_id: str, spur_dict: dict) -> tuple[str, dict]:
+    """
+    Fill in defaults for a spur dict and build the Firestore document data.
+
+    Args:
+        user_id (str): The ID of the user saving the spur.
+        spur_dict (dict): A dictionary containing spur details; missing ids are filled in place.
+    Returns:
+        tuple[str, dict]: The spur ID and the document data to write.
+    """
+    if 'user_id' not in spur_dict:
+        spur_dict['user_id'] = user_id
+    if 'spur_id' not in spur_dict:
+        spur_id = generate_spur_id(user_id)
+        spur_dict['spur_id'] = spur_id
+    else:
+        spur_id = spur_dict['spur_id']
+        
+    if 'connection_id' not in spur_dict:
+        spur_dict['connection_id'] = get_null_connection_id(user_id)
+    elif spur_dict.get('connection_id') and not spur_dict.get('connection_name'):
+        connection_name = get_connection_name(user_id, spur_dict['connection_id'])
+        if connection_name:
+            spur_dict['connection_name'] = connection_name
+            
+    if not spur_dict.get('created_at'):
+        # Let Firestore stamp the commit time so timestamps are consistent across instances
+        spur_dict['created_at'] = firestore.SERVER_TIMESTAMP
+
+    if 'text' not in spur_dict or not spur_dict['text']:
+        logger.error("Error: Spur text is required")
+        raise ValueError("Error: Spur text is required")
+
+    doc_data = {k: spur_dict.get(k, "") for k in _SPUR_FIELDS}
+    doc_data["user_id"] = user_id
+    doc_data["spur_id"] = spur_id
+    doc_data["created_at"] = spur_dict["created_at"]
+    doc_data["keywords"] = _spur_keywords(doc_data["text"])
+    return spur_id, doc_data
+
+def save_spur(user_id, spur: dict | Spur) -> dict:
     """
     Save a spur to Firestore.
     
     Args:
         user_id (str): The ID of the user saving the spur.
-        spur (dict): A dictionary containing spur details.
+        spur (dict or Spur): A dictionary or Spur object containing spur details.
     Returns:
         dict: A dictionary indicating success or failure.
         
     """
+    if isinstance(spur, Spur):
+        spur = asdict(spur)
+
+    err_point = __package__ or __name__
+    if not user_id:
+        logger.error("Error in [%s]: Missing user ID in save_spur", err_point)
+        return {"error": f"{err_point} - Error: Missing user ID in save_spur", "status_code": 400}
+    if not spur or not isinstance(spur, dict):
+        logger.error("Error in [%s]: Missing or invalid spur in save_spur", err_point)
+        return {"error": f"{err_point} - Error: Missing or invalid spur in save_spur", "status_code": 400}
+    if not spur.get('text'):
+        logger.error("Error in [%s]: Spur text is required", err_point)
+        return {"error": f"{err_point} - Error: Spur text is required", "status_code": 400}
+
+    try:
+        is_new = 'spur_id' not in spur
+        spur_id, doc_data = _build_spur_doc(user_id, spur)
+
+        doc_ref = _spurs_collection(user_id).document(spur_id)
+        if is_new:
+            # Freshly generated ID: create() writes without overwrite semantics
+            try:
+                doc_ref.create(doc_data)
+            except AlreadyExists:
+                doc_ref.set(doc_data)
+        else:
+            doc_ref.set(doc_data)
+    except GoogleAPICallError as e:
+        logger.error("[%s] Firestore error saving spur: %s", err_point, e)
+        return {"error": f"{err_point} - Error: {str(e)}", "status_code": 500}
+    except Exception as e:
+        logger.error("[%s] Unexpected error saving spur: %s", err_point, e, exc_info=True)
+        raise
+
+    _invalidate_spur_cache(user_id, (spur_id,))
+    return {"success": "spur saved", "spur_id": doc_ref.id}
+
+
+def save_spurs_bulk(user_id: str, spurs: list[dict]) -> dict:
+    """
+    Save multiple spurs to Firestore using batched writes.
+
+    Writes are committed in chunks of up to 500 (Firestore's batch limit), so N spurs
+    cost ceil(N/500) round-trips instead of N. Multiple entries for the same spur_id
+    are collapsed to the last one, since a batch may not write the same document twice.
+
+    Args:
+        user_id (str): The ID of the user saving the spurs.
+        spurs (list[dict]): A list of dictionaries containing spur details.
+    Returns:
+        dict: A dictionary indicating success or failure.
+    """
     try:
         if not user_id:
             err_point = __package__ or __name__
-            logger.error("Error in [%s]: Missing user ID in save_spur", err_point)
-            raise ValueError("Error: Missing user ID in save_spur")
+            logger.error("Error in [%s]: Missing user ID in save_spurs_bulk", err_point)
+            raise ValueError("Error: Missing user ID in save_spurs_bulk")
 
-        if not spur or not isinstance(spur, dict):
+        if not spurs or not isinstance(spurs, list) or not all(isinstance(s, dict) for s in spurs):
             err_point = __package__ or __name__
-            logger.error("Error in [%s]: Missing user ID in save_spur", err_point)
-            raise ValueError("Error: Missing user ID in save_spur")
+            logger.error("Error in [%s]: Missing or invalid spurs in save_spurs_bulk", err_point)
+            raise ValueError("Error: Missing or invalid spurs in save_spurs_bulk")
+
+        docs_by_id = {}
+        for spur_dict in spurs:
+            spur_id, doc_data = _build_spur_doc(user_id, spur_dict)
+            docs_by_id[spur_id] = doc_data
 
-        user_id = user_id
-        if not user_id:
-            err_point = __package__ or __name__
-            logger.error("Error in [%s]: No user_id found in flask context", err_point)
-            raise ValueError("Error: No user_id found in flask context")
-        
-        spur_dict = spur
-        if 'user_id' not in spur_dict:
-            spur_dict['user_id'] = user_id
-        if 'spur_id' not in spur_dict:
-            spur_id = generate_spur_id(user_id)
-            spur_dict['spur_id'] = spur_id
-        else:
-            spur_id = spur_dict['spur_id']
-            
-        if 'connection_id' not in spur_dict:
-            spur_dict['connection_id'] = get_null_connection_id(user_id)
-        elif spur_dict.get('connection_id'):
-            connection_id = spur_dict['connection_id']
-            connection = get_connection_profile(user_id, connection_id)
-            if connection: 
-                spur_dict['connection_name'] = ConnectionProfile.get_attr_as_str(connection, "connection_name")
-                
-        if 'created_at' not in spur_dict:
-            spur_dict['created_at'] = datetime.now(timezone.utc)
-
-        if 'text' not in spur_dict or not spur_dict['text']:
-            logger.error("Error: Spur text is required")
-            raise ValueError("Error: Spur text is required")
-        
-        
-        
         db = get_firestore_db()
-        doc_ref = db.collection("users").document(user_id).collection("spurs").document(spur_id)
-        doc_data = {
-            "user_id": user_id,
-            "spur_id": spur_id,
-            "conversation_id": spur_dict.get("conversation_id", ""),
-            "connection_id": spur_dict.get("connection_id", ""),
-            "connection_name": spur_dict.get("connection_name", ""),
-            "situation": spur_dict.get("situation", ""),
-            "topic": spur_dict.get("topic", ""),
-            "variant": spur_dict.get("variant", ""),
-            "tone": spur_dict.get("tone", ""),
-            "text": spur_dict.get("text", ""),
-            "created_at": spur_dict.get("created_at", datetime.now(timezone.utc))
-        }
-
-        doc_ref.set(doc_data)
-        
-        return {"success": "spur saved", "spur_id": doc_ref.id}
+        spurs_ref = _spurs_collection(user_id)
+        items = list(docs_by_id.items())
+        batches = []
+        for start in range(0, len(items), FIRESTORE_BATCH_LIMIT):
+            batch = db.batch()
+            for spur_id, doc_data in items[start:start + FIRESTORE_BATCH_LIMIT]:
+                batch.set(spurs_ref.document(spur_id), doc_data)
+            batches.append(batch)
+
+        if len(batches) == 1:
+            batches[0].commit()
+        else:
+            # Batches touch disjoint documents, so their commits can overlap on the write pool
+            commit_futures = [_spur_write_executor.submit(batch.commit) for batch in batches]
+            for future in commit_futures:
+                future.result()
+        _invalidate_spur_cache(user_id, docs_by_id.keys())
+
+        return {"success": "spurs saved", "spur_ids": list(docs_by_id.keys())}
     except Exception as e:
         err_point = __package__ or __name__
         logger.error("[%s] Error: %s", err_point, e)
         return {"error": f"{err_point} - Error: {str(e)}", "status_code": 500}
 
 
+def save_spurs_parallel(user_id: str, spurs: list[dict]) -> list[dict]:
+    """
+    Save multiple spurs to Firestore with concurrent individual writes.
+
+    Each spur goes through save_spur on a shared pool of up to 40 workers, so the
+    round-trips overlap instead of running back to back. Inputs are submitted in groups
+    of up to 500, each group finishing before the next starts, to avoid piling up
+    thousands of in-flight RPCs. Must not be called from a pool worker.
+
+    Args:
+        user_id (str): The ID of the user saving the spurs.
+        spurs (list[dict]): A list of dictionaries containing spur details.
+    Returns:
+        list[dict]: The save_spur result for each spur, in input order.
+    """
+    if not spurs:
+        return []
+    app = current_app._get_current_object()
+
+    def _save_one(spur_dict):
+        with app.app_context():
+            return save_spur(user_id, spur_dict)
+
+    results = []
+    for start in range(0, len(spurs), FIRESTORE_BATCH_LIMIT):
+        group = spurs[start:start + FIRESTORE_BATCH_LIMIT]
+        results.extend(_spur_write_executor.map(_save_one, group))
+    return results
+
+
+def _spur_from_doc(spur_doc) -> Spur:
+    """
+    Builds a Spur from a Firestore document snapshot, filling any missing fields with
+    their dataclass defaults (or None).
+    """
+    return _spur_from_data(spur_doc.to_dict())
+
+def _spur_from_data(spurs_data: dict) -> Spur:
+    """ Builds a Spur from stored document data, applying the same field defaults. """
+    complete_data = dict(_SPUR_DEFAULTS)
+    for name, default_factory in _SPUR_FACTORY_FIELDS:
+        complete_data[name] = default_factory()
+    complete_data.update({k: spurs_data[k] for k in spurs_data.keys() & _SPUR_FIELD_NAMES})
+    return Spur.from_dict(complete_data)
+
+def _encode_spur_cursor(created_at: datetime, spur_id: str) -> str:
+    """ Encodes a page boundary (last spur's created_at and document ID) as an opaque, URL-safe cursor string. """
+    payload = json.dumps({"created_at": created_at.isoformat(), "spur_id": spur_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+def _decode_spur_cursor(cursor: str) -> tuple[datetime, str]:
+    """ Decodes a cursor produced by _encode_spur_cursor; raises ValueError if malformed. """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        spur_id = payload["spur_id"]
+        if not isinstance(spur_id, str) or not spur_id:
+            raise ValueError("missing spur_id")
+        return datetime.fromisoformat(payload["created_at"]), spur_id
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def _commit_buffered_spurs(items: list) -> None:
+    """
+    Commits queued (user_id, spur_id, doc_data, future) entries in one batch and
+    resolves their futures. Later writes to the same spur replace earlier ones, since
+    a batch may not touch a document twice.
+    """
+    latest = {}
+    for user_id, spur_id, doc_data, future in items:
+        latest[(user_id, spur_id)] = doc_data
+    try:
+        db = get_firestore_db()
+        batch = db.batch()
+        for (user_id, spur_id), doc_data in latest.items():
+            batch.set(_spurs_collection(user_id).document(spur_id), doc_data)
+        batch.commit()
+    except Exception as e:
+        err_point = __package__ or __name__
+        logger.error("[%s] Error committing %d buffered spurs: %s", err_point, len(latest), e, exc_info=True)
+        for _, _, _, future in items:
+            future.set_exception(e)
+        return
+    for user_id, spur_id in latest:
+        _invalidate_spur_cache(user_id, (spur_id,))
+    for _, spur_id, _, future in items:
+        future.set_result(spur_id)
+
+def _drain_spur_queue(block: bool) -> list:
+    """ Takes up to one batch of entries off the write queue. """
+    items = []
+    try:
+        if block:
+            items.append(_spur_write_queue.get(timeout=SPUR_FLUSH_INTERVAL_SECONDS))
+        while len(items) < FIRESTORE_BATCH_LIMIT:
+            items.append(_spur_write_queue.get_nowait())
+    except queue.Empty:
+        pass
+    return items
+
+def _run_spur_flusher() -> None:
+    while True:
+        items = _drain_spur_queue(block=True)
+        if items:
+            _commit_buffered_spurs(items)
+
+def flush_buffered_spurs() -> None:
+    """ Synchronously commits everything currently queued; registered to run at exit. """
+    while True:
+        items = _drain_spur_queue(block=False)
+        if not items:
+            return
+        _commit_buffered_spurs(items)
+
+atexit.register(flush_buffered_spurs)
+
+def _ensure_spur_flusher() -> None:
+    global _spur_flusher_thread
+    if _spur_flusher_thread is None:
+        with _spur_flusher_lock:
+            if _spur_flusher_thread is None:
+                _spur_flusher_thread = threading.Thread(target=_run_spur_flusher, name="spur-flusher", daemon=True)
+                _spur_flusher_thread.start()
+
+def save_spur_buffered(user_id: str, spur: dict) -> Future:
+    """
+    Validate a spur and queue it for a batched background write.
+
+    Returns as soon as the spur is queued; a background thread commits queued spurs
+    in batches of up to 500. Use save_spur where the caller needs the write to be
+    durable before responding.
+
+    Args:
+        user_id (str): The ID of the user saving the spur.
+        spur (dict): A dictionary containing spur details.
+    Returns:
+        Future: Resolves to the spur_id once committed, or raises the commit error.
+    Raises:
+        ValueError: If the spur is invalid.
+        queue.Full: If the write queue is saturated.
+    """
+    if not user_id:
+        raise ValueError("Error: Missing user ID in save_spur_buffered")
+    if not spur or not isinstance(spur, dict):
+        raise ValueError("Error: Missing or invalid spur in save_spur_buffered")
+
+    spur_id, doc_data = _build_spur_doc(user_id, spur)
+    future = Future()
+    _ensure_spur_flusher()
+    _spur_write_queue.put_nowait((user_id, spur_id, doc_data, future))
+    return future
+
+
+def iter_saved_spurs(user_id: str) -> Iterator[Spur]:
+    """
+    Yields a user's saved spurs one at a time as they stream from Firestore, so only
+    one Spur is held in memory at a time. Firestore errors propagate to the caller.
+    """
+    ref = _spurs_collection(user_id)
+    for spur_doc in ref.select(_SPUR_FIELDS).stream():
+        yield _spur_from_doc(spur_doc)
+
 def get_saved_spurs(user_id: str) -> list[Spur]:
     if not user_id:
         err_point = __package__ or __name__
         logger.error(f"Error: {err_point}")
         return []
     try:
-        db = get_firestore_db()
-        ref = db.collection("users").document(user_id).collection("spurs")
-        spurs_stream = ref.stream()
-        spurs_list = []
-        for spur_doc in spurs_stream:
-            if spur_doc.exists:
-                spurs_data = spur_doc.to_dict()
-                complete_data = {}
-                for f_info in fields(Spur):
-                    if f_info.name in spurs_data:
-                        complete_data[f_info.name] = spurs_data[f_info.name]
-                    elif callable(f_info.default_factory):
-                        complete_data[f_info.name] = f_info.default_factory()
-                    else:
-                        complete_data[f_info.name] = None
-                        
-                spur = Spur.from_dict(complete_data)
-                spurs_list.append(spur)
-        return spurs_list
+        return list(iter_saved_spurs(user_id))
     except Exception as e:
         err_point = __package__ or "spur_service"
         logger.error("[%s] Error getting spurs for user %s: %s", err_point, user_id, e, exc_info=True)
-        return []         
-        
-        # query = ref        
-
-        # if filters:
-        #     if "variant" in filters:
-        #         query = query.where("variant", "==", filters["variant"])
-        #     if "situation" in filters:
-        #         query = query.where("situation", "==", filters["situation"])
-        #     if "date_from" in filters:
-        #         query = query.where("date_saved", ">=", filters["date_from"])
-        #     if "date_to" in filters:
-        #         query = query.where("date_saved", "<=", filters["date_to"])
-        #     sort_order = filters.get("sort", "desc")
-        #     direct = firestore.Query.ASCENDING if sort_order == "asc" else firestore.Query.DESCENDING
-        #     query = query.order_by("date_saved", direction=direct)
-
-        # keyword = filters.get("keyword", "").lower() if filters else ""
-
-        # docs = query.stream()
-        # result = []
-        # for doc in docs:
-        #     data = doc.to_dict()
-        #     if keyword and keyword not in data.get("text", "").lower():
-        #         continue  # Skip if keyword not in text
-
-    #         result.append({
-    #             "spur_id": doc.id,
-    #             "variant": data.get("variant"),
-    #             "text": data.get("text"),
-    #             "situation": data.get("situation"),
-    #             "date_saved": data.get("date_saved")
-    #         })
-
-    #     return result
-    # except Exception as e:
-    #     err_point = __package__ or __name__
-    #     logger.error("[%s] Error: %s", err_point, e)
-    #     return f"error - {err_point} - Error: {str(e)}", 500
+        return []
+
+
+def get_saved_spurs_page(user_id: str, page_size: int = 50, cursor: Optional[str] = None, filters: Optional[dict] = None) -> dict:
+    """
+    Fetch one page of a user's saved spurs, newest first.
+
+    Uses a server-side order_by/limit/start_after query, so each call reads at most
+    page_size documents regardless of how many spurs the user has saved.
+
+    Args:
+        user_id (str): The ID of the user whose spurs to fetch.
+        page_size (int): Maximum number of spurs to return.
+        cursor (str, optional): The next_cursor returned by the previous page.
+        filters (dict, optional): Server-side filters; supports "variant" and "situation"
+            (exact match) and "keyword" (a single word matched against the spur text).
+            Spurs saved before keywords were stored only match once backfill_spur_keywords
+            has run.
+    Returns:
+        dict: {"items": list[Spur], "next_cursor": str or None}
+    Raises:
+        ValueError: If the cursor is malformed or the keyword is not a single word.
+    """
+    if not user_id:
+        err_point = __package__ or __name__
+        logger.error(f"Error: {err_point}")
+        return {"items": [], "next_cursor": None}
+
+    filters = {k: v for k, v in (filters or {}).items() if k in SPUR_FILTER_FIELDS and v}
+    if "keyword" in filters:
+        # Tokenize like _spur_keywords so the value matches a stored array element
+        keyword_tokens = _spur_keywords(filters["keyword"])
+        if len(keyword_tokens) != 1:
+            raise ValueError("Keyword must be a single word")
+        filters["keyword"] = keyword_tokens[0]
+    cache_key = (user_id, page_size, cursor, tuple(sorted(filters.items())))
+    with _spur_cache_lock:
+        cached_page = _spur_page_cache.get(cache_key)
+    if cached_page is not None:
+        return cached_page
+
+    spurs_ref = _spurs_collection(user_id)
+    query = spurs_ref.select(_SPUR_FIELDS)
+    if "variant" in filters:
+        query = query.where("variant", "==", filters["variant"])
+    if "situation" in filters:
+        query = query.where("situation", "==", filters["situation"])
+    if "keyword" in filters:
+        query = query.where("keywords", "array_contains", filters["keyword"])
+    # Document ID breaks created_at ties; a batch of spurs saved together shares one
+    # server timestamp, and a page boundary inside it must not skip the rest
+    query = query.order_by("created_at", direction=firestore.Query.DESCENDING)\
+                 .order_by("__name__", direction=firestore.Query.DESCENDING)
+    if cursor:
+        created_at, spur_id = _decode_spur_cursor(cursor)
+        query = query.start_after({"created_at": created_at, "__name__": spurs_ref.document(spur_id)})
+    query = query.limit(page_size)
+
+    try:
+        spur_docs = list(query.stream())
+        spurs_list = [_spur_from_doc(spur_doc) for spur_doc in spur_docs]
+    except Exception as e:
+        err_point = __package__ or "spur_service"
+        logger.error("[%s] Error getting spurs page for user %s: %s", err_point, user_id, e, exc_info=True)
+        return {"items": [], "next_cursor": None}
+
+    next_cursor = None
+    if len(spurs_list) == page_size and spurs_list[-1].created_at:
+        next_cursor = _encode_spur_cursor(spurs_list[-1].created_at, spur_docs[-1].id)
+    page = {"items": spurs_list, "next_cursor": next_cursor}
+    with _spur_cache_lock:
+        _spur_page_cache[cache_key] = page
+    return page
+
+
+
+def iter_all_spurs(page_size: int = FIRESTORE_BATCH_LIMIT, limit: Optional[int] = None) -> Iterator[Spur]:
+    """
+    Yields spurs across all users, newest first, for administrative reads.
+
+    Uses one collection_group("spurs") query paged with start_after on the last
+    snapshot, instead of streaming each user's subcollection separately.
+
+    Args:
+        page_size (int): Number of documents fetched per round-trip.
+        limit (int, optional): Stop after this many spurs.
+    """
+    query = (
+        get_firestore_db().collection_group("spurs")
+        .select(_SPUR_FIELDS)
+        .order_by("created_at", direction=firestore.Query.DESCENDING)
+    )
+    yielded = 0
+    last_doc = None
+    while limit is None or yielded < limit:
+        fetch = page_size if limit is None else min(page_size, limit - yielded)
+        page_query = query.start_after(last_doc) if last_doc is not None else query
+        docs = list(page_query.limit(fetch).stream())
+        for spur_doc in docs:
+            yield _spur_from_doc(spur_doc)
+        yielded += len(docs)
+        if len(docs) < fetch:
+            return
+        last_doc = docs[-1]
+
+
+def backfill_spur_keywords(page_size: int = FIRESTORE_BATCH_LIMIT) -> int:
+    """
+    Writes the keywords field on spurs saved before it existed, so keyword search in
+    get_saved_spurs_page finds them. Safe to re-run; spurs that already have keywords
+    are skipped.
+
+    Args:
+        page_size (int): Number of documents read, and at most written, per round-trip.
+    Returns:
+        int: The number of spurs updated.
+    """
+    db = get_firestore_db()
+    query = db.collection_group("spurs").select(["text", "keywords"])
+    updated = 0
+    last_doc = None
+    while True:
+        page_query = query.start_after(last_doc) if last_doc is not None else query
+        docs = list(page_query.limit(page_size).stream())
+        stale = [spur_doc for spur_doc in docs if "keywords" not in (spur_doc.to_dict() or {})]
+        if stale:
+            batch = db.batch()
+            for spur_doc in stale:
+                batch.update(spur_doc.reference, {"keywords": _spur_keywords(spur_doc.to_dict().get("text", ""))})
+            batch.commit()
+            for spur_doc in stale:
+                _invalidate_spur_cache(spur_doc.reference.parent.parent.id, [spur_doc.id])
+            updated += len(stale)
+        if len(docs) < page_size:
+            break
+        last_doc = docs[-1]
+    logger.error("LOG.INFO: Backfilled keywords on %d spurs", updated)
+    return updated
 
 
 def delete_saved_spur(user_id, spur_id):
@@ -165,9 +550,9 @@ def delete_saved_spur(user_id, spur_id):
         return f"error - {err_point} - Error:", 400
 
     try:
-        db = get_firestore_db()
-        doc_ref = db.collection("users").document(user_id).collection("spurs").document(spur_id)
+        doc_ref = _spurs_collection(user_id).document(spur_id)
         doc_ref.delete()
+        _invalidate_spur_cache(user_id, (spur_id,))
         return {"success": "spur deleted"}
     except Exception as e:
         err_point = __package__ or __name__
@@ -181,12 +566,19 @@ def get_spur(spur_id: str) -> Spur:
         err_point = __package__ or __name__
         logger.error(f"Error: {err_point} - Missing user_id or spur_id")
         raise ValueError("Error: Missing user_id or spur_id")
+    with _spur_cache_lock:
+        cached_spur = _spur_cache.get(spur_id)
+    if cached_spur is not None:
+        return cached_spur
     try:
-        db = get_firestore_db()
-        doc_ref = db.collection("users").document(user_id).collection("spurs").document(spur_id)
-        doc = doc_ref.get()
-        if doc.exists:
-            spur = Spur.from_dict(doc)
+        doc_ref = _spurs_collection(user_id).document(spur_id)
+        # Project to the stored spur fields; a missing document yields to_dict() None
+        doc = doc_ref.get(field_paths=_SPUR_FIELDS)
+        spur_data = doc.to_dict()
+        if spur_data is not None:
+            spur = _spur_from_data(spur_data)
+            with _spur_cache_lock:
+                _spur_cache[spur_id] = spur
             return spur
         else:
             err_point = __package__ or __name__
@@ -197,3 +589,67 @@ def get_spur(spur_id: str) -> Spur:
         logger.error("[%s] Error: %s", err_point, e)
         raise ValueError(f"error - {err_point} - Error: {str(e)}")
 
+
+def get_spurs(spur_ids: list[str]) -> list[Spur]:
+    """
+    Fetch multiple spurs by ID in a single batched Firestore read.
+
+    Args:
+        spur_ids (list[str]): Spur IDs to fetch; each encodes its owner's user_id.
+    Returns:
+        list[Spur]: The spurs that exist, in the order of spur_ids.
+    """
+    if not spur_ids:
+        return []
+    try:
+        refs = []
+        for spur_id in dict.fromkeys(spur_ids):
+            user_id = extract_user_id_from_other_id(spur_id)
+            if user_id:
+                refs.append(_spurs_collection(user_id).document(spur_id))
+
+        spurs_by_id = {}
+        for snap in get_firestore_db().get_all(refs):
+            if snap.exists:
+                spurs_by_id[snap.id] = _spur_from_doc(snap)
+        return [spurs_by_id[spur_id] for spur_id in spur_ids if spur_id in spurs_by_id]
+    except Exception as e:
+        err_point = __package__ or __name__
+        logger.error("[%s] Error: %s", err_point, e)
+        raise ValueError(f"error - {err_point} - Error: {str(e)}")
+
+
+def _update_spurs_connection_name(user_id: str, connection_id: str, connection_name: str) -> int:
+    spurs_ref = _spurs_collection(user_id)
+    refs = [doc.reference for doc in spurs_ref.where("connection_id", "==", connection_id).select([]).stream()]
+    db = get_firestore_db()
+    for start in range(0, len(refs), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for ref in refs[start:start + FIRESTORE_BATCH_LIMIT]:
+            batch.update(ref, {"connection_name": connection_name})
+        batch.commit()
+    _invalidate_spur_cache(user_id, [ref.id for ref in refs])
+    logger.error("LOG.INFO: Updated connection_name on %d spurs for connection %s", len(refs), connection_id)
+    return len(refs)
+
+def propagate_connection_name(user_id: str, connection_id: str, connection_name: str) -> Future:
+    """
+    Rewrites the denormalized connection_name on a connection's saved spurs in the
+    background, so reads never need to join against the connection profile.
+
+    Args:
+        user_id (str): The ID of the user who owns the connection.
+        connection_id (str): The renamed connection.
+        connection_name (str): The new name.
+    Returns:
+        Future: Resolves to the number of spurs updated.
+    """
+    def _run():
+        try:
+            return _update_spurs_connection_name(user_id, connection_id, connection_name)
+        except Exception as e:
+            err_point = __package__ or __name__
+            logger.error("[%s] Error updating spurs for connection %s: %s", err_point, connection_id, e, exc_info=True)
+            raise
+
+    return _spur_write_executor.submit(_run)
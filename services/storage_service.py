@@ -1,14 +1,24 @@
+from cachetools import TTLCache
 from class_defs.conversation_def import Conversation
 from datetime import datetime, timezone, timedelta
 from flask import g, current_app
 from google.cloud import firestore
 from google.cloud import storage 
-from infrastructure.clients import get_firestore_db
+from google.cloud.storage.retry import DEFAULT_RETRY as GCS_RETRY
+from PIL import Image, ImageOps
+import io
+from infrastructure.adapters import detect_image_format
+from infrastructure.clients import FIRESTORE_WRITE_RETRY, get_firestore_db
 from infrastructure.logger import get_logger
+import base64
+import copy
+import orjson
+import re
 import uuid
 from werkzeug.utils import secure_filename
-from typing import List, Dict, Optional, Any
+from typing import IO, Any, Dict, Iterator, List, Optional
 from dataclasses import dataclass
+from dataclasses import field as attr_field
 import threading
 
 logger = get_logger(__name__)
@@ -16,6 +26,52 @@ logger = get_logger(__name__)
 # Configuration for profile image uploads
 MAX_PROFILE_IMAGE_SIZE_BYTES = 10 * 1024 * 1024  # 10MB
 ALLOWED_PROFILE_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+# Names that secure_filename would return unchanged
+_SAFE_FILENAME_RE = re.compile(r"[A-Za-z0-9](?:[A-Za-z0-9_.-]*[A-Za-z0-9-])?")
+
+# One GCS client (and its HTTP session/credentials) shared by every upload
+_gcs_client: Optional[storage.Client] = None
+_gcs_client_lock = threading.Lock()
+_gcs_buckets: Dict[str, storage.Bucket] = {}
+
+# Uploads at or below the client's multipart limit go in a single request with no
+# chunk buffer; larger ones are resumable and get a chunk size fitted to the payload
+GCS_MULTIPART_UPLOAD_MAX_BYTES = 8 * 1024 * 1024
+GCS_CHUNK_SIZE_MULTIPLE = 256 * 1024
+
+# Profile images at or above this size are re-encoded before upload
+PROFILE_IMAGE_RECOMPRESS_MIN_BYTES = 256 * 1024
+PROFILE_IMAGE_MAX_DIM = 2048
+PROFILE_IMAGE_JPEG_QUALITY = 85
+
+# Recently read conversations, keyed by (user_id, conversation_id); entries are
+# dropped on save/delete so a cache hit never outlives a write from this process.
+# The cache keeps its own copy and hands out a fresh one per hit, so callers that
+# mutate a returned Conversation never touch the cached entry
+CONVERSATION_CACHE_TTL_SECONDS = 60
+_conversation_cache = TTLCache(maxsize=10000, ttl=CONVERSATION_CACHE_TTL_SECONDS)
+_conversation_cache_lock = threading.Lock()
+
+
+def _get_cached_conversation(user_id: str, conversation_id: str) -> Optional[Conversation]:
+    """Returns a private copy of the cached conversation, or None on a miss."""
+    with _conversation_cache_lock:
+        cached = _conversation_cache.get((user_id, conversation_id))
+    return copy.deepcopy(cached) if cached is not None else None
+
+
+def _cache_conversation(user_id: str, conversation_id: str, conversation: Conversation) -> None:
+    """Stores a copy of conversation so later changes to it stay out of the cache."""
+    snapshot = copy.deepcopy(conversation)
+    with _conversation_cache_lock:
+        _conversation_cache[(user_id, conversation_id)] = snapshot
+
+
+def _invalidate_conversation_cache(user_id: str, conversation_ids) -> None:
+    """Drops cached conversations for conversation_ids under user_id."""
+    with _conversation_cache_lock:
+        for conversation_id in conversation_ids:
+            _conversation_cache.pop((user_id, conversation_id), None)
 
 
 @dataclass
@@ -28,6 +84,11 @@ class ConversationSearchParams:
     date_to: Optional[datetime] = None
     sort: str = "desc"
     limit: int = 20
+    # (created_at, conversation_id) to resume after, as decoded from a page cursor
+    cursor: Optional[tuple] = None
+    # Epoch-second forms of date_from/date_to for timestamp filters, computed once
+    date_from_ts: Optional[int] = attr_field(default=None, init=False)
+    date_to_ts: Optional[int] = attr_field(default=None, init=False)
     
     def __post_init__(self):
         """Validate and normalize parameters."""
@@ -42,6 +103,38 @@ class ConversationSearchParams:
         # Ensure date_to includes the entire day if time is midnight
         if self.date_to and self.date_to.time() == datetime.min.time():
             self.date_to = self.date_to + timedelta(days=1) - timedelta(microseconds=1)
+        
+        self.date_from_ts = int(self.date_from.timestamp()) if self.date_from else None
+        self.date_to_ts = int(self.date_to.timestamp()) if self.date_to else None
+
+
+def _encode_conversation_cursor(boundary: tuple) -> str:
+    """
+    Encodes a page boundary, the (stored created_at value, conversation_id) of the
+    last document read, as an opaque, URL-safe cursor.
+    """
+    created_at, conversation_id = boundary
+    payload = {"conversation_id": conversation_id}
+    if isinstance(created_at, datetime):
+        payload.update(created_at=created_at.isoformat(), datetime=True)
+    else:
+        payload["created_at"] = created_at
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).decode("ascii")
+
+
+def _decode_conversation_cursor(cursor: str) -> tuple:
+    """Decodes a cursor from _encode_conversation_cursor; raises ValueError if malformed."""
+    try:
+        payload = orjson.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        created_at = payload["created_at"]
+        if payload.get("datetime"):
+            created_at = datetime.fromisoformat(created_at)
+        conversation_id = payload["conversation_id"]
+        if not isinstance(conversation_id, str) or not conversation_id:
+            raise ValueError("missing conversation_id")
+        return created_at, conversation_id
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
 
 
 class StorageServiceError(Exception):
@@ -59,6 +152,20 @@ class AlgoliaIndexingError(StorageServiceError):
     pass
 
 
+# App config is fixed after startup, so values are read through current_app once
+_config_cache: Dict[str, Any] = {}
+
+
+def _cfg(key: str) -> Any:
+    """Returns current_app.config[key], cached after the first non-None lookup."""
+    value = _config_cache.get(key)
+    if value is None:
+        value = current_app.config.get(key)
+        if value is not None:
+            _config_cache[key] = value
+    return value
+
+
 def _allowed_profile_image_file(filename: str) -> bool:
     """Checks if the filename has an allowed extension."""
     if not filename:
@@ -67,17 +174,61 @@ def _allowed_profile_image_file(filename: str) -> bool:
            filename.rsplit('.', 1)[1].lower() in ALLOWED_PROFILE_IMAGE_EXTENSIONS
 
 
-def upload_profile_image(user_id: str, connection_id: str, image_bytes: bytes, 
-                        original_filename: str, content_type: str) -> str:
+def _get_gcs_client() -> storage.Client:
+    """Returns the shared GCS client, creating it on first use."""
+    global _gcs_client
+    if _gcs_client is None:
+        with _gcs_client_lock:
+            if _gcs_client is None:
+                _gcs_client = storage.Client()
+    return _gcs_client
+
+
+def _get_bucket(bucket_name: str) -> storage.Bucket:
+    """Returns a cached bucket handle on the shared GCS client."""
+    bucket = _gcs_buckets.get(bucket_name)
+    if bucket is None:
+        # setdefault keeps the first handle if two requests race here
+        bucket = _gcs_buckets.setdefault(bucket_name, _get_gcs_client().bucket(bucket_name))
+    return bucket
+
+
+def _compress_profile_image(source: IO[bytes]) -> Optional[bytes]:
+    """
+    Re-encodes a profile image as a progressive JPEG no larger than
+    PROFILE_IMAGE_MAX_DIM on either side, honouring EXIF orientation.
+    Returns None for animated images or if the image cannot be decoded.
+    """
+    try:
+        img = Image.open(source)
+        if getattr(img, "is_animated", False):
+            return None
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((PROFILE_IMAGE_MAX_DIM, PROFILE_IMAGE_MAX_DIM), Image.Resampling.LANCZOS)
+        output_buffer = io.BytesIO()
+        img.convert("RGB").save(output_buffer, format="JPEG", quality=PROFILE_IMAGE_JPEG_QUALITY,
+                                optimize=True, progressive=True)
+        return output_buffer.getvalue()
+    except Exception as e:
+        logger.error(f"Profile image recompression skipped: {e}")
+        return None
+
+
+def upload_profile_image(user_id: str, connection_id: str, image_bytes: Optional[bytes], 
+                        original_filename: str, content_type: str,
+                        image_stream: Optional[IO[bytes]] = None,
+                        content_length: Optional[int] = None) -> str:
     """
     Uploads a profile image to Google Cloud Storage and returns its public URL.
     
     Args:
         user_id: The ID of the user uploading the image
         connection_id: The ID of the connection this image is for
-        image_bytes: The image content in bytes
+        image_bytes: The image content in bytes, or None when image_stream is given
         original_filename: The original filename of the uploaded image
         content_type: The content type of the image
+        image_stream: Seekable file-like object streamed to GCS instead of image_bytes
+        content_length: Size of image_stream in bytes; required with image_stream
         
     Returns:
         The public URL of the uploaded image
@@ -91,34 +242,67 @@ def upload_profile_image(user_id: str, connection_id: str, image_bytes: bytes,
         logger.error(f"User {user_id} attempted to upload invalid file type: {original_filename}")
         raise ValueError(f"Invalid file type. Allowed: {', '.join(ALLOWED_PROFILE_IMAGE_EXTENSIONS)}")
     
-    # Validate file size
-    if not image_bytes:
+    # Validate file size without reading a stream
+    if image_stream is not None:
+        size = content_length or 0
+    else:
+        size = len(image_bytes) if image_bytes else 0
+    if not size:
         raise ValueError("Profile picture cannot be empty")
         
-    if len(image_bytes) > MAX_PROFILE_IMAGE_SIZE_BYTES:
-        size_mb = len(image_bytes) / (1024 * 1024)
+    if size > MAX_PROFILE_IMAGE_SIZE_BYTES:
+        size_mb = size / (1024 * 1024)
         max_mb = MAX_PROFILE_IMAGE_SIZE_BYTES / (1024 * 1024)
         raise ValueError(f"File size ({size_mb:.1f}MB) exceeds {max_mb}MB limit")
     
+    # A streamed upload is checked by its leading bytes only, then rewound
+    if image_stream is not None:
+        header = image_stream.read(16)
+        image_stream.seek(0)
+        if detect_image_format(header) is None:
+            raise ValueError("Profile picture is not a recognized image")
+    
     # Get storage configuration
-    bucket_name = current_app.config.get("GCS_PROFILE_PICS_BUCKET")
+    bucket_name = _cfg("GCS_PROFILE_PICS_BUCKET")
     if not bucket_name:
         raise StorageServiceError("Storage bucket not configured")
     
+    # Large images are shrunk before the PUT; the original is kept if that fails
+    # or does not make it smaller
+    if size >= PROFILE_IMAGE_RECOMPRESS_MIN_BYTES:
+        compressed = _compress_profile_image(
+            image_stream if image_stream is not None else io.BytesIO(image_bytes)
+        )
+        if image_stream is not None:
+            image_stream.seek(0)
+        if compressed and len(compressed) < size:
+            image_bytes, image_stream, size = compressed, None, len(compressed)
+            content_type = "image/jpeg"
+    
     try:
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(bucket_name)
+        bucket = _get_bucket(bucket_name)
         
         # Create unique filename
-        s_filename = secure_filename(original_filename)
-        unique_id = str(uuid.uuid4())
+        s_filename = (original_filename if _SAFE_FILENAME_RE.fullmatch(original_filename)
+                      else secure_filename(original_filename))
+        unique_id = uuid.uuid4().hex
         gcs_path = f"users/{user_id}/connections/{connection_id}/{unique_id}-{s_filename}"
         
         # Upload to GCS
         blob = bucket.blob(gcs_path)
-        blob.upload_from_string(image_bytes, content_type=content_type)
+        if size > GCS_MULTIPART_UPLOAD_MAX_BYTES:
+            # Resumable upload: send it as one chunk sized to the payload (256 KiB multiple)
+            blob.chunk_size = -(-size // GCS_CHUNK_SIZE_MULTIPLE) * GCS_CHUNK_SIZE_MULTIPLE
+        # No transport compression: the client never gzips upload bodies and no
+        # Content-Encoding is set, since the image format is already compressed.
+        # The object name is unique, so retrying the upload is safe even without a
+        # generation precondition
+        if image_stream is not None:
+            blob.upload_from_file(image_stream, size=size, content_type=content_type, retry=GCS_RETRY)
+        else:
+            blob.upload_from_string(image_bytes, content_type=content_type, retry=GCS_RETRY)
         
-        logger.error(f"LOG.INFO: Uploaded profile picture for user={user_id}, connection={connection_id}: {gcs_path}")
+        logger.error("LOG.INFO: Uploaded profile picture for user=%s, connection=%s: %s", user_id, connection_id, gcs_path)
         return blob.public_url
         
     except Exception as e:
@@ -143,8 +327,9 @@ class ConversationStorage:
             raise ValueError("Missing conversation_id")
             
         # Ensure conversation_id has proper format
-        if conversation.conversation_id.startswith(":"):
-            conversation.conversation_id = f"{conversation.user_id}{conversation.conversation_id}"
+        conversation_id = conversation.conversation_id
+        if conversation_id[:1] == ":":
+            conversation.conversation_id = conversation.user_id + conversation_id
     
     def _prepare_algolia_payload(self, conversation: Conversation, 
                                   conversation_text: str) -> Dict[str, Any]:
@@ -159,12 +344,13 @@ class ConversationStorage:
             "created_at_timestamp": int(created_at.timestamp()),
         }
         
-        # Add optional fields
-        optional_fields = ["connection_id", "situation", "topic"]
-        for field in optional_fields:
-            value = getattr(conversation, field, None)
-            if value:
-                payload[field] = value
+        # Add optional fields only when set, so no empty keys are sent
+        if conversation.connection_id:
+            payload["connection_id"] = conversation.connection_id
+        if conversation.situation:
+            payload["situation"] = conversation.situation
+        if conversation.topic:
+            payload["topic"] = conversation.topic
                 
         return payload
     
@@ -177,14 +363,14 @@ class ConversationStorage:
     #             if not algolia_client or not conversation_text:
     #                 return
                     
-    #             index_name = current_app.config.get('ALGOLIA_CONVERSATIONS_INDEX')
+    #             index_name = _cfg('ALGOLIA_CONVERSATIONS_INDEX')
     #             if not index_name:
     #                 logger.error("Algolia index name not configured")
     #                 return
                 
     #             payload = self._prepare_algolia_payload(conversation, conversation_text)
     #             algolia_client.save_object(index_name, payload)
-    #             logger.error(f"LOG.INFO: Indexed conversation {conversation.conversation_id} to Algolia")
+    #             logger.error("LOG.INFO: Indexed conversation %s to Algolia", conversation.conversation_id)
                 
     #         except Exception as e:
     #             logger.error(f"Failed to index to Algolia: {e}", exc_info=True)
@@ -228,20 +414,19 @@ class ConversationStorage:
                     logger.error(f"Invalid created_at format, using current time")
                     conversation.created_at = datetime.now(timezone.utc)
             
-            # Get conversation text for indexing
-            conversation_text = conversation.conversation_as_string()
-            
             # Save to Firestore
             db = get_firestore_db()
             doc_ref = db.collection("users").document(conversation.user_id).collection("conversations").document(conversation.conversation_id)
 
             doc_data = conversation.to_dict()
-            doc_ref.set(doc_data)
+            doc_ref.set(doc_data, retry=FIRESTORE_WRITE_RETRY)
+            _invalidate_conversation_cache(conversation.user_id, (conversation.conversation_id,))
             
-            logger.error(f"LOG.INFO: Saved conversation {conversation.conversation_id} to Firestore")
+            logger.error("LOG.INFO: Saved conversation %s to Firestore", conversation.conversation_id)
             
-            # Index to Algolia in background thread
-            #self._index_to_algolia_background(conversation, conversation_text)
+            # Index to Algolia in background thread; the text comes from the in-memory
+            # conversation, so indexing never re-reads the saved document
+            #self._index_to_algolia_background(conversation, conversation.conversation_as_string())
             
             return {
                 "success": "conversation saved",
@@ -254,6 +439,52 @@ class ConversationStorage:
                 raise
             raise StorageServiceError(f"Save operation failed: {e}")
     
+    def save_conversations_bulk(self, conversations: List[Conversation]) -> Dict[str, Any]:
+        """
+        Saves many conversations to Firestore with a BulkWriter.
+
+        Unlike save_conversation, writes are not serialized: the BulkWriter sends
+        them as parallel individual writes and retries throttled ones itself.
+        
+        Args:
+            conversations: The conversations to save
+            
+        Returns:
+            Dict with success status and the saved conversation_ids
+            
+        Raises:
+            ValueError: If validation fails for any conversation
+            StorageServiceError: If the bulk write fails
+        """
+        for conversation in conversations:
+            self._validate_conversation_data(conversation)
+            if not conversation.created_at:
+                conversation.created_at = datetime.now(timezone.utc)
+
+        try:
+            db = get_firestore_db()
+            bulk_writer = db.bulk_writer()
+            for conversation in conversations:
+                doc_ref = db.collection("users").document(conversation.user_id)\
+                           .collection("conversations").document(conversation.conversation_id)
+                # The large, never-queried "conversation" and "spurs" fields are
+                # exempt from indexing (firestore.indexes.json) to cut index fan-out
+                bulk_writer.set(doc_ref, conversation.to_dict())
+            bulk_writer.close()
+            for conversation in conversations:
+                _invalidate_conversation_cache(conversation.user_id, (conversation.conversation_id,))
+            
+            logger.error("LOG.INFO: Bulk saved %d conversations to Firestore", len(conversations))
+            
+            return {
+                "success": "conversations saved",
+                "conversation_ids": [c.conversation_id for c in conversations]
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to bulk save conversations: {e}", exc_info=True)
+            raise StorageServiceError(f"Bulk save operation failed: {e}")
+    
     def get_conversation(self, user_id: str, conversation_id: str) -> Conversation:
         """
         Retrieves a conversation by ID.
@@ -271,6 +502,10 @@ class ConversationStorage:
         """
         if not user_id or not conversation_id:
             raise ValueError("Both user_id and conversation_id are required")
+        
+        cached_conversation = _get_cached_conversation(user_id, conversation_id)
+        if cached_conversation is not None:
+            return cached_conversation
             
         try:
             db = get_firestore_db()
@@ -282,7 +517,9 @@ class ConversationStorage:
                     f"Conversation {conversation_id} not found for user {user_id}"
                 )
                 
-            return Conversation.from_dict(doc.to_dict())
+            conversation = Conversation.from_firestore_snapshot(doc)
+            _cache_conversation(user_id, conversation_id, conversation)
+            return conversation
             
         except Exception as e:
             if isinstance(e, ConversationNotFoundError):
@@ -313,22 +550,23 @@ class ConversationStorage:
             db = get_firestore_db()
             doc_ref = db.collection("users").document(user_id)\
                        .collection("conversations").document(conversation_id)
-            doc_ref.delete()
+            doc_ref.delete(retry=FIRESTORE_WRITE_RETRY)
+            _invalidate_conversation_cache(user_id, (conversation_id,))
             
-            logger.error(f"LOG.INFO: Deleted conversation {conversation_id} from Firestore")
+            logger.error("LOG.INFO: Deleted conversation %s from Firestore", conversation_id)
             
             # Delete from Algolia in background
             # def _delete_from_algolia():
             #     try:
             #         algolia_client = get_algolia_client()
-            #         index_name = current_app.config.get('ALGOLIA_CONVERSATIONS_INDEX')
+            #         index_name = _cfg('ALGOLIA_CONVERSATIONS_INDEX')
                     
             #         if algolia_client and index_name:
             #             algolia_client.delete_object(
             #                 index_name=index_name, 
             #                 object_id=conversation_id
             #             )
-            #             logger.error(f"LOG.INFO: Deleted conversation {conversation_id} from Algolia")
+            #             logger.error("LOG.INFO: Deleted conversation %s from Algolia", conversation_id)
             #     except Exception as e:
             #         logger.error(f"Failed to delete from Algolia: {e}", exc_info=True)
             
@@ -362,87 +600,149 @@ class ConversationStorage:
             return []
     
     
+    def _build_firestore_query(self, params: ConversationSearchParams):
+        """Builds the filtered, ordered and limited conversations query for params."""
+        db = get_firestore_db()
+        conversations_ref = db.collection("users").document(params.user_id)\
+                              .collection("conversations")
+        query = conversations_ref
+        
+        # Apply filters
+        if params.connection_id:
+            query = query.where("connection_id", "==", params.connection_id)
+            
+        if params.date_from:
+            query = query.where("created_at", ">=", params.date_from)
+            
+        if params.date_to:
+            query = query.where("created_at", "<=", params.date_to)
+        
+        # Apply sorting
+        sort_direction = (firestore.Query.DESCENDING if params.sort == "desc" 
+                        else firestore.Query.ASCENDING)
+        # Document ID breaks created_at ties, so a page boundary never skips or
+        # repeats conversations saved in the same instant
+        query = query.order_by("created_at", direction=sort_direction)\
+                     .order_by("__name__", direction=sort_direction)
+        
+        # Seek past the previous page on the index rather than re-reading it
+        if params.cursor is not None:
+            created_at, conversation_id = params.cursor
+            query = query.start_after({
+                "created_at": created_at,
+                "__name__": conversations_ref.document(conversation_id),
+            })
+        
+        # Apply limit
+        return query.limit(params.limit)
+    
+    def _conversation_from_doc(self, doc) -> Optional[Conversation]:
+        """Parses a snapshot, or returns None if it is missing or fails to parse."""
+        try:
+            if doc.exists:
+                return Conversation.from_firestore_snapshot(doc)
+        except Exception as e:
+            logger.error(f"Error parsing conversation document: {e}")
+        return None
+    
+    def _iter_conversation_docs(self, docs) -> Iterator[Conversation]:
+        """Yields a Conversation per existing snapshot, skipping ones that fail to parse."""
+        for doc in docs:
+            conversation = self._conversation_from_doc(doc)
+            if conversation is not None:
+                yield conversation
+    
+    def iter_conversations(self, params: ConversationSearchParams) -> Iterator[Conversation]:
+        """
+        Yields matching conversations as Firestore streams them in, so callers can
+        write each one out without holding the whole result list.
+        """
+        keyword_pattern = (re.compile(re.escape(params.keyword), re.IGNORECASE)
+                           if params.keyword else None)
+        for conversation in self._iter_conversation_docs(self._build_firestore_query(params).stream()):
+            if keyword_pattern is None or keyword_pattern.search(conversation.conversation_as_string()):
+                yield conversation
+    
     def _search_with_firestore(self, params: ConversationSearchParams) -> List[Conversation]:
         """Searches conversations using Firestore."""
+        return self._search_page_with_firestore(params)["items"]
+    
+    def _search_page_with_firestore(self, params: ConversationSearchParams) -> Dict[str, Any]:
+        """
+        Reads one page of conversations from Firestore, starting after params.cursor.
+        
+        Returns:
+            Dict with "items" (matching conversations) and "next_cursor", the
+            (created_at, conversation_id) of the last document scanned, or None
+            on the final page
+        """
         try:
-            db = get_firestore_db()
-            query = db.collection("users").document(params.user_id)\
-                     .collection("conversations")
-            
-            # Apply filters
-            if params.connection_id:
-                query = query.where("connection_id", "==", params.connection_id)
-                
-            if params.date_from:
-                query = query.where("created_at", ">=", params.date_from)
-                
-            if params.date_to:
-                query = query.where("created_at", "<=", params.date_to)
+            query = self._build_firestore_query(params)
             
-            # Apply sorting
-            sort_direction = (firestore.Query.DESCENDING if params.sort == "desc" 
-                            else firestore.Query.ASCENDING)
-            query = query.order_by("created_at", direction=sort_direction)
+            scanned = 0
+            last_scanned = None
             
-            # Apply limit
-            query = query.limit(params.limit)
+            # If keyword search was requested but Algolia wasn't available, do basic
+            # filtering on the streamed results
+            keyword_pattern = (re.compile(re.escape(params.keyword), re.IGNORECASE)
+                               if params.keyword else None)
             
             # Execute query
-            docs = query.stream()
             conversations = []
-            for doc in docs:
-                try:
-                    if doc.exists:
-                        conversations.append(Conversation.from_dict(doc.to_dict()))
-                except Exception as e:
-                    logger.error(f"Error parsing conversation document: {e}")
+            for doc in query.stream():
+                scanned += 1
+                last_scanned = (doc.get("created_at"), doc.id)
+                conversation = self._conversation_from_doc(doc)
+                if conversation is None:
                     continue
+                if keyword_pattern is None or keyword_pattern.search(conversation.conversation_as_string()):
+                    conversations.append(conversation)
             
-            # If keyword search was requested but Algolia wasn't available,
-            # do basic filtering on the results
-            if params.keyword:
-                keyword_lower = params.keyword.lower()
-                conversations = [
-                    c for c in conversations
-                    if keyword_lower in c.conversation_as_string().lower()
-                ]
-            
-            return conversations
+            next_cursor = last_scanned if scanned == params.limit else None
+            return {"items": conversations, "next_cursor": next_cursor}
             
         except Exception as e:
             logger.error(f"Firestore search failed: {e}", exc_info=True)
-            return []
+            return {"items": [], "next_cursor": None}
     
     def _batch_fetch_conversations(self, user_id: str, conversation_ids: List[str], 
                                    limit: int) -> List[Conversation]:
-        """Fetches conversations from Firestore in batches."""
-        conversations = []
+        """
+        Fetches conversations from Firestore by document ID in one batched read.
+        get_all has no 10-ID cap like an 'in' filter, so any number of IDs go in a
+        single streamed RPC.
+        """
+        conversation_ids = list(dict.fromkeys(conversation_ids))
+        db = get_firestore_db()
+        conversations_ref = db.collection("users").document(user_id).collection("conversations")
+        
+        # Conversations already in the read cache skip the round trip; only the
+        # rest go to Firestore
+        cached = {cid: _get_cached_conversation(user_id, cid) for cid in conversation_ids}
+        
+        # Document IDs are the conversation_ids, so a primary-key get_all replaces
+        # chunked 'in' queries; snapshots may come back in any order
+        refs = [conversations_ref.document(cid) for cid in conversation_ids
+                if cached.get(cid) is None]
+        try:
+            snapshots = {snap.id: snap for snap in db.get_all(refs)} if refs else {}
+        except Exception as e:
+            logger.error(f"Error in batch fetch: {e}", exc_info=True)
+            return []
         
-        # Firestore 'in' queries are limited to 10 items
-        for i in range(0, len(conversation_ids), 10):
-            chunk = conversation_ids[i:i + 10]
-            if not chunk:
+        conversations = []
+        for cid in conversation_ids:
+            if len(conversations) >= limit:
+                break
+            if cached.get(cid) is not None:
+                conversations.append(cached[cid])
                 continue
-                
+            snap = snapshots.get(cid)
             try:
-                db = get_firestore_db()
-                query = db.collection("users").document(user_id)\
-                         .collection("conversations")\
-                         .where("conversation_id", "in", chunk)
-                
-                docs = query.stream()
-                for doc in docs:
-                    try:
-                        if doc.exists and len(conversations) < limit:
-                            conversations.append(Conversation.from_dict(doc.to_dict()))
-                    except Exception as e:
-                        logger.error(f"Error parsing conversation in batch: {e}")
-                        continue
-                        
-                if len(conversations) >= limit:
-                    break
+                if snap is not None and snap.exists:
+                    conversations.append(Conversation.from_firestore_snapshot(snap))
             except Exception as e:
-                logger.error(f"Error in batch fetch: {e}", exc_info=True)
+                logger.error(f"Error parsing conversation in batch: {e}")
                 continue
                 
         return conversations
@@ -469,6 +769,19 @@ def save_conversation(data: Conversation) -> Dict[str, str]:
     return _storage.save_conversation(data)
 
 
+def save_conversations_bulk(conversations: List[Conversation]) -> Dict[str, Any]:
+    """
+    Saves multiple conversations in one bulk write.
+    
+    Args:
+        conversations: The conversations to save
+        
+    Returns:
+        Status dict with success message and conversation_ids
+    """
+    return _storage.save_conversations_bulk(conversations)
+
+
 def get_conversation(user_id: str, conversation_id: str) -> Conversation:
     """
     Gets a conversation by the conversation_id.
@@ -526,18 +839,66 @@ def get_conversations(user_id: str, filters: Optional[Dict[str, Any]] = None) ->
         logger.error("Missing user_id for get_conversations")
         return []
     
-    # Convert filters dict to ConversationSearchParams
+    return _storage.search_conversations(_search_params(user_id, filters))
+
+
+def _search_params(user_id: str, filters: Optional[Dict[str, Any]]) -> ConversationSearchParams:
+    """Converts a filters dict to ConversationSearchParams."""
     if filters is None:
         filters = {}
-        
-    params = ConversationSearchParams(
+    
+    cursor = filters.get("cursor")
+    return ConversationSearchParams(
         user_id=user_id,
         keyword=filters.get("keyword"),
         connection_id=filters.get("connection_id"),
         date_from=filters.get("date_from"),
         date_to=filters.get("date_to"),
         sort=filters.get("sort", "desc"),
-        limit=filters.get("limit", 20)
+        limit=filters.get("limit", 20),
+        cursor=_decode_conversation_cursor(cursor) if cursor else None
     )
+
+
+def get_conversations_page(user_id: str, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Fetches one page of conversations, resuming after filters["cursor"] if given.
+    
+    Args:
+        user_id: User ID associated with the conversations
+        filters: Same criteria as get_conversations, plus "cursor" (the next_cursor
+            returned by the previous page)
+        
+    Returns:
+        Dict with "items" (Conversation objects) and "next_cursor" (str or None)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not user_id:
+        logger.error("Missing user_id for get_conversations_page")
+        return {"items": [], "next_cursor": None}
+    
+    page = _storage._search_page_with_firestore(_search_params(user_id, filters))
+    next_cursor = page["next_cursor"]
+    return {
+        "items": page["items"],
+        "next_cursor": _encode_conversation_cursor(next_cursor) if next_cursor else None
+    }
+
+
+def iter_conversations(user_id: str, filters: Optional[Dict[str, Any]] = None) -> Iterator[Conversation]:
+    """
+    Yields conversations matching filters one at a time as Firestore returns them.
     
-    return _storage.search_conversations(params)
\ No newline at end of file
+    Args:
+        user_id: User ID associated with the conversations
+        filters: Same criteria as get_conversations_page
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not user_id:
+        logger.error("Missing user_id for iter_conversations")
+        return iter(())
+    return _storage.iter_conversations(_search_params(user_id, filters))
@@ -6,7 +6,13 @@ import os
 import praw
 from datetime import datetime, timezone
 import requests
-from infrastructure.clients import get_firestore_db
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import threading
+from functools import lru_cache
+from cachetools import TTLCache
+from concurrent.futures import Future, ThreadPoolExecutor
+from infrastructure.clients import FIRESTORE_WRITE_RETRY, get_firestore_db
 from infrastructure.logger import get_logger
 from trendspy import Trends  
 
@@ -14,19 +20,44 @@ diagnostic_bp = Blueprint("diagnostic", __name__)
 
 logger = get_logger(__name__)
 
+@lru_cache(maxsize=1)
+def _weekly_pool_ref():
+    """The topic pool document reference, resolved once on first use."""
+    return get_firestore_db().collection("trending_topics").document("weekly_pool")
+
 def strip_trailing_source(title):
     return re.sub(r'\s*[-–|]\s*[^-–|]+$', '', title)
 
+# Pool refreshes run on this single worker so reads never wait on the external fetches
+_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="topic-refresh")
+_refresh_lock = threading.Lock()
+_refresh_future = None
+
+def _refresh_logged():
+    try:
+        return refresh_if_stale()
+    except Exception as e:
+        logger.error(f"ERROR in {__name__}: Background topic refresh failed with an error: {e}", exc_info=True)
+        return False
+
+def refresh_in_background() -> Future:
+    """Schedules refresh_if_stale() in the background unless a refresh is already running."""
+    global _refresh_future
+    with _refresh_lock:
+        if _refresh_future is None or _refresh_future.done():
+            _refresh_future = _refresh_executor.submit(_refresh_logged)
+        return _refresh_future
+
 def get_all_trending_topics():
     
-    refresh_if_stale()
+    # Serve the current pool; a stale one is refreshed for later reads
+    refresh_in_background()
     
     try:
-        db = get_firestore_db()
-        doc = db.collection("trending_topics").document("weekly_pool").get()
+        doc = _weekly_pool_ref().get()
 
         if not doc.exists:
-            return jsonify({"status": "error", "message": "No topic pool found"}), 404
+            return jsonify({"status": "error", "message": "Trending topics are warming up"}), 503
 
         data = doc.to_dict()
         topics = data.get("topics", [])
@@ -46,12 +77,26 @@ def get_all_trending_topics():
 # NewsAPI setup
 NEWS_API_KEY = os.environ.get("NEWS_API_KEY")
 CATEGORIES = ["entertainment", "sports", "science", "general"]
+NEWSAPI_URL = "https://newsapi.org/v2/top-headlines"
+# (connect, read) timeouts for NewsAPI requests
+NEWSAPI_TIMEOUT_SECONDS = (3, 10)
+
+# Keep-alive connection pool shared by the per-category NewsAPI requests, sized
+# for the concurrent fan-out, with a short backoff retry on connection errors and 5xx
+_newsapi_session = requests.Session()
+_newsapi_session.mount("https://", HTTPAdapter(
+    pool_connections=8, pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+))
+
+BANNED_WORDS = ['murder', 'death', 'war', 'rape', 'sexual assault', 'israel', 'palestine', 'suicide', 'sale', 'bargain', 'poll', 'deal', 'die', 'russia', 'ukrain', 'gaza', 'strikes', 'buzzfeed', 'horoscope']
+# Substring match like the original per-word `in` checks (so 'ukrain' still
+# catches 'Ukraine'), done in one case-insensitive pass over the title
+_BANNED_RE = re.compile('|'.join(re.escape(word) for word in BANNED_WORDS), re.IGNORECASE)
 
 def is_safe_topic(text: str) -> bool:
     """Simple keyword-based filter to exclude sensitive topics."""
-    
-    banned_words = ['murder', 'death', 'war', 'rape', 'sexual assault', 'israel', 'palestine', 'suicide', 'sale', 'bargain', 'poll', 'deal', 'die', 'russia', 'ukrain', 'gaza', 'strikes', 'buzzfeed', 'horoscope']
-    return not any(word in text.lower() for word in banned_words)
+    return _BANNED_RE.search(text) is None
 
 
 def get_google_trends(limit=5):
@@ -89,30 +134,35 @@ def get_google_trends(limit=5):
         return [] 
 
 
+def _fetch_newsapi_category(cat, limit_per):
+    params = {
+        "country": "us",
+        "category": cat,
+        "pageSize": limit_per,
+        "apiKey": NEWS_API_KEY
+    }
+    try:
+        r = _newsapi_session.get(NEWSAPI_URL, params=params, timeout=NEWSAPI_TIMEOUT_SECONDS)
+        articles = r.json().get("articles", [])
+        return [{
+            "topic": strip_trailing_source(a["title"]),
+            "source": f"NewsAPI-{cat}"
+        } for a in articles]
+    except Exception as e:
+        logger.error(f"ERROR in {__name__}: NewsAPI request for {cat} failed with an error: {e}")
+        return []
+
+
 def get_newsapi_topics(categories=CATEGORIES, limit_per=5):
     
     results = []
-    try:
-        for cat in categories:
-            url = "https://newsapi.org/v2/top-headlines"
-            params = {
-                "country": "us",
-                "category": cat,
-                "pageSize": limit_per,
-                "apiKey": NEWS_API_KEY
-            }
-            r = requests.get(url, params=params)
-            articles = r.json().get("articles", [])
-            for a in articles:
-                title = strip_trailing_source(a["title"])
-                results.append({
-                    "topic": title,
-                    "source": f"NewsAPI-{cat}"
-                })
-        return results
-    except Exception as e:
-        logger.error(f"ERROR in {__name__}: NewsAPI request failed with an error: {e}")
+    if not categories:
         return results
+    # One request per category, all in flight at once; map keeps category order
+    with ThreadPoolExecutor(max_workers=len(categories)) as executor:
+        for topics in executor.map(lambda cat: _fetch_newsapi_category(cat, limit_per), categories):
+            results.extend(topics)
+    return results
 
 def fetch_reddit_topics(subreddits=["TodayILearned", "UpliftingNews", "news", "goodnews"], limit=10):
 
@@ -141,13 +191,27 @@ def fetch_reddit_topics(subreddits=["TodayILearned", "UpliftingNews", "news", "g
         return results
 
 
+# The pool only changes on a refresh (every few days), so random draws reuse a
+# recent copy instead of downloading the whole topic list each time
+TOPIC_POOL_CACHE_TTL_SECONDS = 300
+_topic_pool_cache = TTLCache(maxsize=1, ttl=TOPIC_POOL_CACHE_TTL_SECONDS)
+_topic_pool_cache_lock = threading.Lock()
+
+def _get_cached_topic_pool():
+    with _topic_pool_cache_lock:
+        topics = _topic_pool_cache.get("topics")
+    if topics is not None:
+        return topics
+    doc = _weekly_pool_ref().get(field_paths=["topics"])
+    topics = (doc.to_dict() or {}).get("topics", []) if doc.exists else []
+    if topics:
+        with _topic_pool_cache_lock:
+            _topic_pool_cache["topics"] = topics
+    return topics
+
 def get_random_trending_topic():
     try:
-        db = get_firestore_db()
-        doc = db.collection("trending_topics").document("weekly_pool").get()
-        if not doc.exists:
-            return None
-        topics = doc.to_dict().get("topics", [])
+        topics = _get_cached_topic_pool()
         if not topics:
             return None
         return random.choice(topics).get("topic")
@@ -156,9 +220,9 @@ def get_random_trending_topic():
         return None
 
 def refresh_if_stale():
-    db = get_firestore_db()
-    doc_ref = db.collection("trending_topics").document("weekly_pool")
-    doc = doc_ref.get()
+    doc_ref = _weekly_pool_ref()
+    # Staleness only needs the timestamp, not the whole topic list
+    doc = doc_ref.get(field_paths=["last_updated"])
 
     should_refresh = False
 
@@ -179,12 +243,19 @@ def refresh_if_stale():
                 should_refresh = True
 
     if should_refresh:
-        all_topics = get_google_trends() + get_newsapi_topics(CATEGORIES, limit_per=10) + fetch_reddit_topics(limit=10)
+        # The three sources are independent network fetches, so run them together
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="topic-sources") as executor:
+            google_future = executor.submit(get_google_trends)
+            newsapi_future = executor.submit(get_newsapi_topics, CATEGORIES, limit_per=10)
+            reddit_future = executor.submit(fetch_reddit_topics, limit=10)
+            all_topics = google_future.result() + newsapi_future.result() + reddit_future.result()
         filtered = [t for t in all_topics if is_safe_topic(t["topic"])]
         doc_ref.set({
             "topics": filtered,
             "last_updated": datetime.now(timezone.utc).isoformat()
-        })
+        }, retry=FIRESTORE_WRITE_RETRY)
+        with _topic_pool_cache_lock:
+            _topic_pool_cache.pop("topics", None)
         print(f"Refreshed {len(filtered)} topics.")
         return True
     else:
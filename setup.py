@@ -36,6 +36,8 @@ setup(
         # External APIs & Utilities
         "praw>=7.8.1",  # [cite: 1]
         "requests>=2.32.3",  # [cite: 1]
+        "cachetools>=5.5.2",
+        "orjson>=3.10.0",
     ],
     extras_require={
         "dev": [
@@ -0,0 +1,37 @@
+import io
+from types import SimpleNamespace
+
+from PIL import Image
+
+from utils import ocr_utils
+
+
+class _FakeVisionClient:
+    """Answers every image with an empty, successful text annotation."""
+
+    def __init__(self):
+        self.requests = []
+
+    def batch_annotate_images(self, requests, **kwargs):
+        self.requests.extend(requests)
+        response = SimpleNamespace(error=SimpleNamespace(message=""), text_annotations=[])
+        return SimpleNamespace(responses=[response for _ in requests])
+
+
+def _png_bytes():
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 80), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_undecodable_screenshot_does_not_fail_the_batch(monkeypatch):
+    vision_client = _FakeVisionClient()
+    monkeypatch.setattr(ocr_utils, "_require_vision_client", lambda: vision_client)
+
+    results = ocr_utils._run_ocr_batch([_png_bytes(), b"not an image", _png_bytes()])
+
+    assert results[0] == ([], None)
+    assert results[2] == ([], None)
+    assert results[1][0] == []
+    assert results[1][1].startswith("Error preparing screenshot for OCR")
+    assert len(vision_client.requests) == 2
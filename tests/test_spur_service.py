@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import firestore
+from google.cloud.firestore_v1.base_document import DocumentSnapshot
+from google.cloud.firestore_v1.query import Query
+
+from services import spur_service
+
+USER_ID = "user-1"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    client = firestore.Client(project="test-project", credentials=AnonymousCredentials())
+    monkeypatch.setattr(spur_service, "get_firestore_db", lambda: client)
+    with spur_service._spur_cache_lock:
+        spur_service._spur_page_cache.clear()
+    return client
+
+
+def _snapshot(db, spur_id, created_at):
+    ref = db.collection("users").document(USER_ID).collection("spurs").document(spur_id)
+    data = {"user_id": USER_ID, "spur_id": spur_id, "text": "hi", "created_at": created_at}
+    return DocumentSnapshot(ref, data, True, None, None, None)
+
+
+def _stream_from(monkeypatch, snapshots):
+    """Serves snapshots from Query.stream and records each query it was called on."""
+    streamed = []
+
+    def _stream(query, *args, **kwargs):
+        streamed.append(query)
+        return iter(snapshots)
+
+    monkeypatch.setattr(Query, "stream", _stream)
+    return streamed
+
+
+def test_pages_resume_after_last_spur_in_a_created_at_tie(db, monkeypatch):
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    _stream_from(monkeypatch, [_snapshot(db, f"{USER_ID}:s{i}", created_at) for i in range(2)])
+
+    page = spur_service.get_saved_spurs_page(USER_ID, page_size=2)
+    assert [spur.spur_id for spur in page["items"]] == [f"{USER_ID}:s0", f"{USER_ID}:s1"]
+    assert page["next_cursor"]
+
+    streamed = _stream_from(monkeypatch, [])
+    spur_service.get_saved_spurs_page(USER_ID, page_size=2, cursor=page["next_cursor"])
+    query = streamed[0]._to_protobuf()
+
+    assert [order.field.field_path for order in query.order_by] == ["created_at", "__name__"]
+    assert [order.direction.name for order in query.order_by] == [Query.DESCENDING, Query.DESCENDING]
+    assert query.start_at.before is False
+    created_at_value, name_value = query.start_at.values
+    assert created_at_value.timestamp_value == created_at
+    assert name_value.reference_value.endswith(f"/users/{USER_ID}/spurs/{USER_ID}:s1")
+
+
+def test_cursor_without_spur_id_is_rejected(db):
+    legacy_cursor = spur_service.base64.urlsafe_b64encode(b'{"created_at": "2025-01-01T00:00:00+00:00"}').decode("ascii")
+
+    with pytest.raises(ValueError):
+        spur_service.get_saved_spurs_page(USER_ID, page_size=2, cursor=legacy_cursor)
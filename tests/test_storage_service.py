@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import firestore
+from google.cloud.firestore_v1.base_document import DocumentSnapshot
+from google.cloud.firestore_v1.query import Query
+
+from services import storage_service
+
+USER_ID = "user-1"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    client = firestore.Client(project="test-project", credentials=AnonymousCredentials())
+    monkeypatch.setattr(storage_service, "get_firestore_db", lambda: client)
+    return client
+
+
+def _snapshot(db, conversation_id, created_at):
+    ref = db.collection("users").document(USER_ID).collection("conversations").document(conversation_id)
+    data = {"user_id": USER_ID, "conversation_id": conversation_id, "created_at": created_at}
+    return DocumentSnapshot(ref, data, True, None, None, None)
+
+
+def _stream_from(monkeypatch, snapshots):
+    """Serves snapshots from Query.stream and records each query it was called on."""
+    streamed = []
+
+    def _stream(query, *args, **kwargs):
+        streamed.append(query)
+        return iter(snapshots)
+
+    monkeypatch.setattr(Query, "stream", _stream)
+    return streamed
+
+
+def test_query_orders_by_created_at_then_document_id(db):
+    params = storage_service.ConversationSearchParams(user_id=USER_ID, sort="asc", limit=5)
+    query = storage_service._storage._build_firestore_query(params)._to_protobuf()
+
+    assert [order.field.field_path for order in query.order_by] == ["created_at", "__name__"]
+    assert {order.direction.name for order in query.order_by} == {Query.ASCENDING}
+    assert query.limit == 5
+    assert not query.start_at.values
+
+
+def test_pages_resume_after_last_document_in_a_created_at_tie(db, monkeypatch):
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    first_page = [_snapshot(db, f"{USER_ID}:{i}", created_at) for i in range(2)]
+    _stream_from(monkeypatch, first_page)
+
+    page = storage_service.get_conversations_page(USER_ID, {"limit": 2})
+    assert [c.conversation_id for c in page["items"]] == [f"{USER_ID}:0", f"{USER_ID}:1"]
+    assert page["next_cursor"]
+
+    streamed = _stream_from(monkeypatch, [])
+    storage_service.get_conversations_page(USER_ID, {"limit": 2, "cursor": page["next_cursor"]})
+    query = streamed[0]._to_protobuf()
+
+    assert query.start_at.before is False
+    created_at_value, name_value = query.start_at.values
+    assert created_at_value.timestamp_value == created_at
+    assert name_value.reference_value.endswith(f"/users/{USER_ID}/conversations/{USER_ID}:1")
+    assert [order.direction.name for order in query.order_by] == [Query.DESCENDING, Query.DESCENDING]
+
+
+def test_short_page_has_no_next_cursor(db, monkeypatch):
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    _stream_from(monkeypatch, [_snapshot(db, f"{USER_ID}:0", created_at - timedelta(seconds=1))])
+
+    page = storage_service.get_conversations_page(USER_ID, {"limit": 2})
+
+    assert len(page["items"]) == 1
+    assert page["next_cursor"] is None
@@ -1,5 +1,5 @@
 from infrastructure.logger import get_logger
-from typing import Any, Union, Dict, List, Optional
+from typing import Any, Union, Dict, Iterator, List, Optional
 import numpy as np
 import re
 from dataclasses import dataclass
@@ -8,14 +8,29 @@ from sklearn.cluster import DBSCAN
 import cv2
 from PIL import Image
 from google.cloud import vision
+from google.api_core import retry
+from google.api_core.exceptions import DeadlineExceeded, InternalServerError, ServiceUnavailable
 from infrastructure.clients import get_vision_client
 from google.cloud import vision
 from flask import current_app
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import io
+import os
+import threading
 
 
 logger = get_logger(__name__)
 
+# Request threads (and the preprocessing pool below) already provide parallelism;
+# letting each OpenCV call also fan out across every core oversubscribes the CPU.
+# Keep the SIMD/IPP-optimized code paths enabled explicitly.
+cv2.setNumThreads(1)
+cv2.setUseOptimized(True)
+if not cv2.useOptimized():
+    logger.warning("OpenCV optimized code paths are unavailable; image analysis will be slower")
+
 
 @dataclass
 class MessageBlock:
@@ -521,7 +536,7 @@ def crop_top_bottom_cv(img: np.ndarray) -> Union[np.ndarray, None]:
         img: A NumPy array containing the image content
         
     Returns:
-        Cropped image or None if crop is invalid
+        Cropped view of img (rows sliced in place, no pixel copy) or None if crop is invalid
     """
     if img is None:
         raise ValueError("Unable to open image.")
@@ -548,7 +563,8 @@ def crop_top_bottom_cv(img: np.ndarray) -> Union[np.ndarray, None]:
         logger.error("Invalid crop boundaries")
         return None
     
-    # Perform cropping
+    # Perform cropping; basic slicing returns a view, so callers can hand it straight
+    # to an encoder without an intermediate copy
     cropped_image = img[start_row:end_row, :]
     
     return cropped_image
@@ -656,20 +672,193 @@ class VisualConversationExtractor:
         return bool(distance > threshold)
 
 
-def perform_ocr_on_screenshot(screenshot_bytes: bytes) -> List[str]:
+# Vision API caps the number of images accepted in a single batch_annotate_images call
+MAX_IMAGES_PER_BATCH = 16
+
+# Crop + re-encode is CPU-bound and Pillow releases the GIL while encoding,
+# so screenshots in a batch are preprocessed in parallel on a shared pool
+_ocr_preprocess_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="ocr-preprocess")
+
+# Cropped screenshots are re-encoded as JPEG (much faster and smaller than PNG);
+# set OCR_ENCODE_FORMAT=PNG to restore lossless uploads for debugging
+OCR_ENCODE_FORMAT = os.environ.get("OCR_ENCODE_FORMAT", "JPEG").upper()
+OCR_JPEG_QUALITY = 85
+
+# Vision OCR accuracy saturates well below full phone-screenshot resolution;
+# larger screenshots are downscaled so their long edge is at most this many pixels
+OCR_MAX_EDGE = int(os.environ.get("OCR_MAX_EDGE", 1600))
+OCR_RESIZE_REDUCING_GAP = 2.0
+
+# Formats Vision decodes itself; other inputs (e.g. MPO, PSD) are re-encoded first
+VISION_NATIVE_FORMATS = frozenset({'JPEG', 'PNG', 'GIF', 'BMP', 'WEBP', 'TIFF', 'ICO'})
+
+
+# Feature list shared by every OCR request, built once instead of per image
+_OCR_FEATURES = [vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)]
+
+
+def _build_ocr_request(image: vision.Image) -> vision.AnnotateImageRequest:
+    """Wraps a Vision image (inline bytes or GCS source) in a text-detection request."""
+    return vision.AnnotateImageRequest(image=image, features=_OCR_FEATURES)
+
+
+# Single retry layer for Vision RPCs: only transient failures are retried, with
+# exponential backoff handled by google.api_core instead of sleeping the worker
+OCR_RPC_TIMEOUT_SECONDS = 60.0
+_OCR_RETRY = retry.Retry(
+    predicate=retry.if_exception_type(ServiceUnavailable, DeadlineExceeded, InternalServerError),
+    initial=0.5,
+    maximum=8.0,
+    multiplier=2.0,
+    timeout=OCR_RPC_TIMEOUT_SECONDS
+)
+
+# Identical screenshots are often re-uploaded (share sheets, client retries);
+# successful OCR results are cached by content hash for a day
+OCR_CACHE_TTL_SECONDS = 24 * 60 * 60
+_ocr_result_cache = TTLCache(maxsize=512, ttl=OCR_CACHE_TTL_SECONDS)
+_ocr_result_cache_lock = threading.Lock()
+
+# Blocking Vision RPCs for multi-chunk batches are overlapped on this pool;
+# the sync client is thread-safe and multiplexes calls over one gRPC channel
+_ocr_rpc_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ocr-rpc")
+
+# perform_ocr_on_screenshots works through large uploads in groups of this many
+# screenshots (several concurrent Vision batches) to bound peak memory
+OCR_STREAM_GROUP_SIZE = MAX_IMAGES_PER_BATCH * 4
+
+
+def _encode_for_ocr(image: Image.Image) -> bytes:
     """
-    Performs OCR on a screenshot with preprocessing to crop top/bottom regions based on specific text.
+    Encodes a PIL image in OCR_ENCODE_FORMAT for a Vision request.
     
     Args:
-        screenshot_bytes: Image bytes of the screenshot on which to perform OCR
+        image: PIL Image object
     
     Returns:
-        List of strings, each representing text from an individual bounding box
+        Encoded image bytes
     """
-    # Validate input
-    if not screenshot_bytes:
-        raise ValueError("Screenshot bytes cannot be empty")
+    img_byte_arr = io.BytesIO()
+    if OCR_ENCODE_FORMAT == 'PNG':
+        image.save(img_byte_arr, format='PNG')
+    else:
+        # JPEG has no alpha channel; screenshots are often RGBA PNGs
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        image.save(img_byte_arr, format='JPEG', quality=OCR_JPEG_QUALITY)
+    return img_byte_arr.getvalue()
+
+
+def _prepare_screenshot(content: bytes) -> tuple:
+    """
+    Opens a screenshot and downscales it when its long edge exceeds OCR_MAX_EDGE.
+    Image.open only parses the header, so a screenshot that is already in a format
+    Vision accepts and within size is passed through without being decoded or re-encoded.
+    
+    Args:
+        content: Original screenshot bytes
+    
+    Returns:
+        Tuple of (PIL Image, bytes to send to Vision); the original bytes are
+        reused when no resize or format conversion was needed
+    """
+    image = Image.open(io.BytesIO(content))
+    if max(image.size) <= OCR_MAX_EDGE:
+        if image.format in VISION_NATIVE_FORMATS:
+            return image, content
+        return image, _encode_for_ocr(image)
+    
+    # Very large JPEGs are decoded at half resolution by libjpeg's integer scaler
+    # (the Pillow equivalent of cv2.IMREAD_REDUCED_COLOR_2); the result is still at
+    # least OCR_MAX_EDGE on the long edge, so no OCR detail is lost
+    if image.format == 'JPEG' and max(image.size) >= 2 * OCR_MAX_EDGE:
+        image.draft('RGB', (image.width // 2, image.height // 2))
+    
+    # reducing_gap lets libjpeg scale JPEGs by 1/2, 1/4 or 1/8 while decoding (via
+    # Image.draft) and box-reduces other formats before the final LANCZOS pass
+    image.thumbnail((OCR_MAX_EDGE, OCR_MAX_EDGE), Image.Resampling.LANCZOS, reducing_gap=OCR_RESIZE_REDUCING_GAP)
+    return image, _encode_for_ocr(image)
+
+
+def _crop_and_encode(image: Image.Image, crop_top: bool, crop_bottom: bool) -> bytes:
+    """
+    Crops a screenshot and encodes the result for a follow-up OCR request.
+    
+    Args:
+        image: PIL Image object
+        crop_top: Whether to crop top 15%
+        crop_bottom: Whether to crop bottom 10%
+    
+    Returns:
+        Encoded bytes of the cropped image
+    """
+    return _encode_for_ocr(crop_screenshot(image, crop_top, crop_bottom))
+
+
+def _prepare_screenshot_or_error(content: bytes) -> tuple:
+    """
+    Runs _prepare_screenshot, catching failures so one undecodable upload doesn't
+    abort the rest of its batch.
+    
+    Returns:
+        Tuple of (PIL Image, bytes to send to Vision, error_message); the image and
+        bytes are None and error_message is set when preprocessing failed
+    """
+    try:
+        image, prepared_content = _prepare_screenshot(content)
+        return image, prepared_content, None
+    except Exception as e:
+        return None, None, f'Error preparing screenshot for OCR: {e}'
+
+
+def _crop_and_encode_or_error(job: tuple) -> tuple:
+    """
+    Runs _crop_and_encode on an (image, crop_top, crop_bottom) job, catching failures
+    so they only affect that screenshot.
+    
+    Returns:
+        Tuple of (encoded bytes or None, error_message or None)
+    """
+    try:
+        return _crop_and_encode(*job), None
+    except Exception as e:
+        return None, f'Error cropping screenshot for OCR: {e}'
+
+
+def _batch_annotate_text(vision_client: vision.ImageAnnotatorClient, images: List[vision.Image]) -> List[Any]:
+    """
+    Runs TEXT_DETECTION on several images with one batch_annotate_images call per
+    MAX_IMAGES_PER_BATCH images. When more than one call is needed, the calls are
+    issued concurrently over the client's shared channel.
+    
+    Args:
+        vision_client: Initialized Google Cloud Vision client
+        images: Vision images (inline content or GCS source) to annotate
+    
+    Returns:
+        List of AnnotateImageResponse objects in the same order as images
+    """
+    def _annotate_chunk(chunk: List[vision.Image]) -> List[Any]:
+        requests = [_build_ocr_request(image) for image in chunk]
+        batch_response = vision_client.batch_annotate_images(
+            requests=requests,
+            retry=_OCR_RETRY,
+            timeout=OCR_RPC_TIMEOUT_SECONDS
+        )
+        return list(batch_response.responses)
+    
+    chunks = [images[start:start + MAX_IMAGES_PER_BATCH] for start in range(0, len(images), MAX_IMAGES_PER_BATCH)]
+    if len(chunks) <= 1:
+        return _annotate_chunk(chunks[0]) if chunks else []
     
+    responses = []
+    for chunk_responses in _ocr_rpc_executor.map(_annotate_chunk, chunks):
+        responses.extend(chunk_responses)
+    return responses
+
+
+def _require_vision_client() -> vision.ImageAnnotatorClient:
+    """Returns the shared Vision client, raising RuntimeError if it cannot be initialized."""
     # Use the vision client from infrastructure.clients
     try:
         vision_client = get_vision_client()
@@ -678,54 +867,193 @@ def perform_ocr_on_screenshot(screenshot_bytes: bytes) -> List[str]:
         raise RuntimeError("Vision client has not been initialized. Ensure init_clients() is called.")
     if vision_client is None:
         raise RuntimeError("Vision client has not been initialized. Ensure init_clients() is called.")
+    return vision_client
+
+
+def _run_ocr_batch(screenshots: List[bytes]) -> List[tuple]:
+    """
+    Performs OCR on several screenshots, cropping top/bottom regions based on specific text.
+    The initial pass and the cropped re-OCR pass are each sent as batched Vision requests.
     
-    content = screenshot_bytes
+    Args:
+        screenshots: Image bytes of the screenshots on which to perform OCR
     
-    # Convert to PIL Image for preprocessing
-    image = Image.open(io.BytesIO(content))
-    width, height = image.size
+    Returns:
+        List of (text_blocks, error_message) tuples in the same order as screenshots;
+        error_message is None when OCR succeeded
+    """
+    vision_client = _require_vision_client()
+    
+    # Convert to PIL Images for preprocessing, downscaling oversized screenshots;
+    # a screenshot that fails here gets its own error and is left out of the batch
+    results: List[tuple] = [([], None)] * len(screenshots)
+    images = {}
+    contents = {}
+    for index, (image, content, error_message) in enumerate(_ocr_preprocess_executor.map(_prepare_screenshot_or_error, screenshots)):
+        if error_message:
+            results[index] = ([], error_message)
+        else:
+            images[index] = image
+            contents[index] = content
     
     # First, perform initial OCR to check for text in top/bottom regions
-    vision_image = vision.Image(content=content)
-    request = vision.AnnotateImageRequest(
-        image=vision_image,
-        features=[vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)]
-    )
-    response = vision_client.annotate_image(request=request)
-
-    if response.error.message:
-        raise Exception(f'Error during OCR: {response.error.message}')
-    
-    # Check if we need to crop
-    crop_top = should_crop_top(response.text_annotations, height)
-    crop_bottom = should_crop_bottom(response.text_annotations, height)
-    
-    # Crop the image if needed
-    if crop_top or crop_bottom:
-        image = crop_screenshot(image, crop_top, crop_bottom)
-        
-        # Convert cropped image back to bytes for OCR
-        img_byte_arr = io.BytesIO()
-        image.save(img_byte_arr, format='PNG')
-        content = img_byte_arr.getvalue()
+    indices = list(images)
+    responses = _batch_annotate_text(vision_client, [vision.Image(content=contents[index]) for index in indices])
+    
+    recrop_indices = []
+    recrop_jobs = []
+    for index, response in zip(indices, responses):
+        if response.error.message:
+            results[index] = ([], f'Error during OCR: {response.error.message}')
+            continue
         
-        # Perform OCR on cropped image
-        vision_image = vision.Image(content=content)
-        request = vision.AnnotateImageRequest(
-            image=vision_image,
-            features=[vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)]
-        )
-        response = vision_client.annotate_image(request=request)
+        # Check if we need to crop
+        image = images[index]
+        width, height = image.size
+        crop_top = should_crop_top(response.text_annotations, height)
+        crop_bottom = should_crop_bottom(response.text_annotations, height)
         
-        if response.error.message:
-            raise Exception(f'Error during OCR on cropped image: {response.error.message}')
+        if crop_top or crop_bottom:
+            recrop_indices.append(index)
+            recrop_jobs.append((image, crop_top, crop_bottom))
+        else:
+            results[index] = (extract_text_blocks(response.text_annotations), None)
+    
+    # Perform OCR on cropped images
+    if recrop_jobs:
+        # Convert cropped images back to bytes for OCR, in parallel
+        cropped_indices = []
+        cropped_contents = []
+        for index, (content, error_message) in zip(recrop_indices, _ocr_preprocess_executor.map(_crop_and_encode_or_error, recrop_jobs)):
+            if error_message:
+                results[index] = ([], error_message)
+            else:
+                cropped_indices.append(index)
+                cropped_contents.append(content)
+        cropped_responses = _batch_annotate_text(vision_client, [vision.Image(content=content) for content in cropped_contents])
+        for index, response in zip(cropped_indices, cropped_responses):
+            if response.error.message:
+                results[index] = ([], f'Error during OCR on cropped image: {response.error.message}')
+            else:
+                results[index] = (extract_text_blocks(response.text_annotations), None)
+    
+    return results
+
+
+def _ocr_screenshot_batch(screenshots: List[bytes]) -> List[tuple]:
+    """
+    Performs OCR on several screenshots, serving screenshots seen recently from an
+    in-process cache keyed by content hash and sending only the rest to Vision.
+    
+    Args:
+        screenshots: Image bytes of the screenshots on which to perform OCR
+    
+    Returns:
+        List of (text_blocks, error_message) tuples in the same order as screenshots;
+        error_message is None when OCR succeeded
+    """
+    keys = [hashlib.blake2b(content, digest_size=16).digest() for content in screenshots]
+    results: List[Optional[tuple]] = [None] * len(screenshots)
+    
+    with _ocr_result_cache_lock:
+        for index, key in enumerate(keys):
+            cached_blocks = _ocr_result_cache.get(key)
+            if cached_blocks is not None:
+                results[index] = (list(cached_blocks), None)
+    
+    miss_indices = [index for index, result in enumerate(results) if result is None]
+    if miss_indices:
+        fresh_results = _run_ocr_batch([screenshots[index] for index in miss_indices])
+        with _ocr_result_cache_lock:
+            for index, (text_blocks, error_message) in zip(miss_indices, fresh_results):
+                results[index] = (text_blocks, error_message)
+                # Only successful OCR is cached so transient Vision errors are retried
+                if error_message is None:
+                    _ocr_result_cache[keys[index]] = tuple(text_blocks)
+    
+    return results
+
+
+def perform_ocr_on_screenshots(screenshots: List[bytes]) -> Iterator[List[str]]:
+    """
+    Performs OCR on several screenshots using batched Vision API requests, yielding
+    results group by group so decoded images for only one group are held at a time.
+    
+    Args:
+        screenshots: Image bytes of the screenshots on which to perform OCR
+    
+    Yields:
+        Text block lists in the same order as screenshots; a screenshot whose
+        OCR fails yields an empty list
+    """
+    for start in range(0, len(screenshots), OCR_STREAM_GROUP_SIZE):
+        group = screenshots[start:start + OCR_STREAM_GROUP_SIZE]
+        for text_blocks, error_message in _ocr_screenshot_batch(group):
+            if error_message:
+                logger.error(error_message)
+            yield text_blocks
+
+
+def perform_ocr_on_screenshot(screenshot_bytes: bytes) -> List[str]:
+    """
+    Performs OCR on a screenshot with preprocessing to crop top/bottom regions based on specific text.
+    
+    Args:
+        screenshot_bytes: Image bytes of the screenshot on which to perform OCR
     
-    # Extract text from individual bounding boxes
-    text_blocks = extract_text_blocks(response.text_annotations)
+    Returns:
+        List of strings, each representing text from an individual bounding box
+    """
+    # Validate input
+    if not screenshot_bytes:
+        raise ValueError("Screenshot bytes cannot be empty")
+    
+    text_blocks, error_message = _ocr_screenshot_batch([screenshot_bytes])[0]
+    if error_message:
+        raise Exception(error_message)
     
     return text_blocks
 
 
+def perform_ocr_on_gcs_uris(gcs_uris: List[str]) -> Iterator[List[str]]:
+    """
+    Performs OCR on screenshots already stored in Google Cloud Storage. Vision reads the
+    images directly, so nothing is downloaded, decoded or uploaded by this service.
+    Instead of re-OCRing a cropped copy, annotations in the cropped top/bottom regions
+    are dropped using the page height reported by Vision.
+    
+    Args:
+        gcs_uris: gs:// URIs of the screenshots on which to perform OCR
+    
+    Yields:
+        Text block lists in the same order as gcs_uris; a screenshot whose
+        OCR fails yields an empty list
+    """
+    if not gcs_uris:
+        return
+    vision_client = _require_vision_client()
+    
+    for start in range(0, len(gcs_uris), OCR_STREAM_GROUP_SIZE):
+        group = gcs_uris[start:start + OCR_STREAM_GROUP_SIZE]
+        images = [vision.Image(source=vision.ImageSource(image_uri=gcs_uri)) for gcs_uri in group]
+        for gcs_uri, response in zip(group, _batch_annotate_text(vision_client, images)):
+            if response.error.message:
+                logger.error(f'Error during OCR for {gcs_uri}: {response.error.message}')
+                yield []
+                continue
+            
+            pages = response.full_text_annotation.pages
+            height = pages[0].height if pages else 0
+            crop_top = bool(height) and should_crop_top(response.text_annotations, height)
+            crop_bottom = bool(height) and should_crop_bottom(response.text_annotations, height)
+            if crop_top or crop_bottom:
+                top = int(height * 0.15) if crop_top else 0
+                bottom = int(height * 0.9) if crop_bottom else height
+                yield extract_text_blocks_in_region(response.text_annotations, top, bottom)
+            else:
+                yield extract_text_blocks(response.text_annotations)
+
+
 def should_crop_top(annotations: List, image_height: int) -> bool:
     """
     Checks if the top 15% of the image contains date, time, percentage, or MNO operator names.
@@ -861,6 +1189,35 @@ def extract_text_blocks(annotations: List) -> List[str]:
     return text_blocks
 
 
+def extract_text_blocks_in_region(annotations: List, top: int, bottom: int) -> List[str]:
+    """
+    Extracts text from bounding boxes that lie entirely between two y-coordinates.
+    
+    Args:
+        annotations: List of text annotations from Google Vision API
+        top: Smallest y-coordinate (inclusive) of the region to keep
+        bottom: Largest y-coordinate (inclusive) of the region to keep
+    
+    Returns:
+        List of strings, each representing text from a bounding box inside the region
+    """
+    if not annotations:
+        return []
+    
+    text_blocks = []
+    for annotation in annotations[1:]:
+        vertices = annotation.bounding_poly.vertices
+        if not vertices:
+            continue
+        if min(vertex.y for vertex in vertices) < top or max(vertex.y for vertex in vertices) > bottom:
+            continue
+        text = annotation.description.strip()
+        if text:
+            text_blocks.append(text)
+    
+    return text_blocks
+
+
 # # Example usage:
 # if __name__ == "__main__":
 #     # Note: Ensure that init_clients() has been called before using this function